@@ -1,31 +1,414 @@
 import pytest
 import logging
 import os
-import base64
+import io
+import re
+import glob
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
+try:
+    from PIL import Image
+except ImportError:
+    # Optional: without Pillow, screenshots are stored as captured
+    Image = None
+
+# Driver caching lives next to this file; command timing comes from the repository's
+# shared helpers directory, which pytest.ini puts on the path
+from driver_binary import cached_driver_path, invalidate
+from driver_metrics import CommandTimer, instrument_driver
+
 # Ensure logs directory exists
 if not os.path.exists("logs"):
     os.makedirs("logs")
 
+# One command timer per test, exported when the session finishes
+COMMAND_TIMERS = []
+WEBDRIVER_COMMANDS_FILE = os.path.join("reports", "webdriver_commands.json")
+
+# Driver pools of this process: one per session, i.e. per pytest-xdist worker
+DRIVER_POOLS = []
+
+# Start of a log record in log_file_format ("%(asctime)s [%(levelname)s] %(message)s")
+LOG_RECORD = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})")
+
+# Tests one browser serves before it is replaced; --driver-max-uses overrides it
+DEFAULT_DRIVER_MAX_USES = 20
+
+# Per-test durations and outcomes of earlier runs, kept in pytest's cache (.pytest_cache)
+TEST_HISTORY_KEY = "herokuapp/test_history"
+# Runs remembered per test; a failure in the last RECENT_FAILURE_RUNS of them puts a test first
+HISTORY_RUNS = 5
+RECENT_FAILURE_RUNS = 3
+
+# Node id -> {'duration': call-phase seconds, 'failed': bool in any phase} for this run
+TEST_RUNS = {}
+
+# Failure screenshots go to a content-addressed store (file name = content hash) and are
+# scaled down and re-encoded as JPEG when Pillow is installed
+DEFAULT_SCREENSHOT_DIR = "screenshots"
+SCREENSHOT_MAX_SIZE = (1280, 800)
+SCREENSHOT_JPEG_QUALITY = 70
+# Scaling and saving run here, off the failing test's path; drained when the session finishes
+SCREENSHOT_WRITER = ThreadPoolExecutor(max_workers=2, thread_name_prefix="screenshot")
+SCREENSHOTS_QUEUED = set()
+
+
+def pytest_addoption(parser):
+    parser.addoption("--driver-max-uses", type=int, default=DEFAULT_DRIVER_MAX_USES,
+                     help="Tests one Chrome instance serves before it is replaced (1: new browser per test)")
+    parser.addoption("--file-order", action="store_true",
+                     help="Run tests in file order instead of recently failing first, then longest first")
+    parser.addoption("--screenshot-dir", default=DEFAULT_SCREENSHOT_DIR,
+                     help=f"Store for failure screenshots (default: {DEFAULT_SCREENSHOT_DIR})")
+
+
+def worker_id(config):
+    """pytest-xdist worker id ("gw0", "gw1", ...), or None in the controller and in serial runs"""
+    return getattr(config, "workerinput", {}).get("workerid")
+
+
+def worker_path(path, worker):
+    """Per-worker variant of an output file: logs/automation.log -> logs/automation.gw0.log"""
+    base, extension = os.path.splitext(path)
+    return f"{base}.{worker}{extension}"
+
+
+def configured_log_file(config):
+    return config.getoption("log_file") or config.getini("log_file")
+
+
+def load_test_history(config):
+    """{node id: {'durations': [seconds], 'outcomes': ["passed" | "failed"]}}, oldest run first"""
+    cache = getattr(config, "cache", None)
+    return cache.get(TEST_HISTORY_KEY, {}) if cache is not None else {}
 
-@pytest.fixture(scope="function")
-def driver(request):
-    logging.info(f"Starting Test: {request.node.name}")
 
-    service = Service(ChromeDriverManager().install())
+def save_test_history(config):
+    """Appends this run's durations and outcomes to the history"""
+    cache = getattr(config, "cache", None)
+    if cache is None or not TEST_RUNS:
+        return
+    history = load_test_history(config)
+    for nodeid, run in TEST_RUNS.items():
+        entry = history.setdefault(nodeid, {'durations': [], 'outcomes': []})
+        entry['durations'] = (entry['durations'] + [round(run['duration'], 3)])[-HISTORY_RUNS:]
+        entry['outcomes'] = (entry['outcomes'] + ["failed" if run['failed'] else "passed"])[-HISTORY_RUNS:]
+    cache.set(TEST_HISTORY_KEY, history)
+
+
+def expected_duration(entry):
+    return sum(entry['durations']) / len(entry['durations'])
+
+
+def recently_failed(entry):
+    return "failed" in entry['outcomes'][-RECENT_FAILURE_RUNS:]
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Orders tests by their history: recently failing tests first for fast feedback,
+    then longest first, so that parallel workers, which take the next test whenever
+    they are free, finish close together (longest-processing-time-first)
+    """
+    if config.getoption("--file-order"):
+        return
+    history = load_test_history(config)
+    known = [expected_duration(history[item.nodeid]) for item in items if item.nodeid in history]
+    if not known:
+        return
+
+    # Tests without history yet are assumed to take an average time
+    average = sum(known) / len(known)
+
+    def priority(item):
+        entry = history.get(item.nodeid)
+        if entry is None:
+            return (1, -average)
+        return (0 if recently_failed(entry) else 1, -expected_duration(entry))
+
+    items.sort(key=priority)
+    if not worker_id(config):
+        failing = sum(1 for item in items if item.nodeid in history and recently_failed(history[item.nodeid]))
+        logging.info(f"Ordered {len(items)} tests from history: {failing} recently failing first, then longest first")
+
+
+def pytest_runtest_logreport(report):
+    run = TEST_RUNS.setdefault(report.nodeid, {'duration': 0.0, 'failed': False})
+    # Setup may include launching Chrome, which says nothing about the test itself:
+    # counting it would make whichever test ran first on a worker look longest
+    if report.when == "call":
+        run['duration'] += report.duration
+    run['failed'] = run['failed'] or report.failed
+
+
+def pytest_configure(config):
+    log_file = configured_log_file(config)
+    worker = worker_id(config)
+    if worker:
+        # Workers never share an output file; the controller merges them at the end
+        if log_file:
+            config.option.log_file = worker_path(log_file, worker)
+        return
+
+    # Fragments left behind by an interrupted parallel run must not be merged into this one
+    stale = glob.glob(worker_path(WEBDRIVER_COMMANDS_FILE, "gw*"))
+    if log_file:
+        stale += glob.glob(worker_path(log_file, "gw*"))
+    for fragment in stale:
+        os.remove(fragment)
+
+
+def resolve_chromedriver():
+    """chromedriver path, resolved by webdriver-manager only when the on-disk cache has none"""
+    return cached_driver_path("chromedriver", lambda: ChromeDriverManager().install())
+
+
+def launch_driver():
     options = webdriver.ChromeOptions()
-    driver = webdriver.Chrome(service=service, options=options)
+    try:
+        return webdriver.Chrome(service=Service(resolve_chromedriver()), options=options)
+    except SessionNotCreatedException:
+        # Chrome was updated past the cached driver: resolve a matching one and retry once
+        logging.warning("Cached chromedriver rejected by Chrome, resolving it again")
+        invalidate("chromedriver")
+        return webdriver.Chrome(service=Service(resolve_chromedriver()), options=options)
+
+
+def reset_browser_state(driver):
+    """Clears what a test may leave behind: extra windows, cookies, storage and the page"""
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+    # Cookies of every domain, not only the current page's
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    driver.execute_script("try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}")
+    driver.get("about:blank")
     driver.maximize_window()
 
+
+class DriverPool:
+    """
+    One reusable Chrome per pytest session (with pytest-xdist: per worker)
+
+    The browser is reset after every test and replaced after max_uses tests,
+    or as soon as resetting it fails (crashed browser, leftover alert).
+    """
+
+    def __init__(self, launch, max_uses):
+        self.launch = launch
+        self.max_uses = max(1, max_uses)
+        self.driver = None
+        self.uses = 0
+        self.launches = 0
+
+    def checkout(self, test_name):
+        """Returns a clean browser for a test, launching one if needed"""
+        if self.driver is None:
+            self.driver = self.launch()
+            instrument_driver(self.driver, test_name)
+            self.driver.maximize_window()
+            self.launches += 1
+            self.uses = 0
+        # Command timings are kept per test, whichever browser ran it
+        self.driver.command_timer = CommandTimer(test_name)
+        self.uses += 1
+        return self.driver
+
+    def checkin(self):
+        """Resets the browser for the next test, or quits it when it is used up or broken"""
+        if self.uses >= self.max_uses:
+            logging.info(f"Replacing browser after {self.uses} tests")
+            self.close()
+            return
+        try:
+            reset_browser_state(self.driver)
+        except WebDriverException as error:
+            logging.warning(f"Browser reset failed, replacing the browser: {error.msg}")
+            self.close()
+
+    def close(self):
+        """Quits the current browser, if any"""
+        driver, self.driver = self.driver, None
+        if driver is None:
+            return
+        try:
+            driver.quit()
+        except WebDriverException:
+            # Already gone, e.g. after a crash
+            pass
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request):
+    pool = DriverPool(launch_driver, request.config.getoption("--driver-max-uses"))
+    DRIVER_POOLS.append(pool)
+    yield pool
+    pool.close()
+    logging.info(f"Browser launches: {pool.launches} for {len(COMMAND_TIMERS)} tests")
+
+
+@pytest.fixture(scope="function")
+def driver(request, driver_pool):
+    logging.info(f"Starting Test: {request.node.name}")
+
+    driver = driver_pool.checkout(request.node.name)
+    COMMAND_TIMERS.append(driver.command_timer)
+
     # Pass driver to test function
     yield driver
 
-    # Teardown: Close browser
-    logging.info(f"Finished Test: {request.node.name}")
-    driver.quit()
+    # Teardown: Reset the browser for the next test
+    logging.info(f"Finished Test: {request.node.name} ({driver.command_timer.command_count} WebDriver commands)")
+    driver_pool.checkin()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """
+    Saves the test history and exports WebDriver command latencies of all tests,
+    merging the workers' in parallel runs
+    """
+    # Screenshots linked from the report must exist before it is opened
+    SCREENSHOT_WRITER.shutdown(wait=True)
+
+    launches = sum(pool.launches for pool in DRIVER_POOLS)
+    os.makedirs("reports", exist_ok=True)
+
+    worker = worker_id(session.config)
+    if worker:
+        # Raw samples, so the controller can compute percentiles over all workers
+        with open(worker_path(WEBDRIVER_COMMANDS_FILE, worker), "w", encoding="utf-8") as handle:
+            json.dump({
+                'browser_launches': launches,
+                'sessions': [timer.to_samples() for timer in COMMAND_TIMERS]
+            }, handle)
+        return
+
+    # The controller receives every worker's test reports, so it alone writes the history
+    save_test_history(session.config)
+
+    timers = list(COMMAND_TIMERS)
+    for fragment in sorted(glob.glob(worker_path(WEBDRIVER_COMMANDS_FILE, "gw*"))):
+        with open(fragment, encoding="utf-8") as handle:
+            data = json.load(handle)
+        timers.extend(CommandTimer.from_samples(samples) for samples in data['sessions'])
+        launches += data['browser_launches']
+        os.remove(fragment)
+    if not timers:
+        return
+
+    all_commands = CommandTimer.merge(timers)
+    logging.info("WebDriver command latency (all tests):\n" + "\n".join(all_commands.summary_lines()))
+    logging.info(f"Browser launches: {launches} for {len(timers)} tests")
+    with open(WEBDRIVER_COMMANDS_FILE, "w", encoding="utf-8") as handle:
+        json.dump({
+            'browser_launches': launches,
+            'all': all_commands.to_dict(),
+            'sessions': [timer.to_dict() for timer in timers]
+        }, handle, indent=2)
+
+
+def split_log_blocks(lines, worker):
+    """
+    Splits a worker's log into blocks that each start at a "Starting Test" record
+
+    Returns:
+        List of ((start time, worker, block number), lines prefixed with the worker id)
+    """
+    blocks = []
+    for line in lines:
+        record = LOG_RECORD.match(line)
+        if not blocks or (record and "Starting Test:" in line):
+            blocks.append(((record.group(1) if record else "", worker, len(blocks)), []))
+        blocks[-1][1].append(f"[{worker}] {line}")
+    return blocks
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_unconfigure(config):
+    """
+    Controller of a parallel run: merges the workers' log files into the configured
+    one, whole tests at a time in start order, followed by the controller's own records
+    """
+    log_file = configured_log_file(config)
+    if worker_id(config) or not log_file:
+        return
+    fragments = sorted(glob.glob(worker_path(log_file, "gw*")))
+    if not fragments:
+        return
+
+    base, extension = os.path.splitext(log_file)
+    blocks = []
+    for fragment in fragments:
+        worker = fragment[len(base) + 1:len(fragment) - len(extension)]
+        with open(fragment, encoding="utf-8") as handle:
+            blocks.extend(split_log_blocks(handle.readlines(), worker))
+    blocks.sort(key=lambda block: block[0])
+
+    # The logging plugin has closed the controller's log file by now (trylast)
+    controller_lines = []
+    if os.path.exists(log_file):
+        with open(log_file, encoding="utf-8") as handle:
+            controller_lines = handle.readlines()
+    with open(log_file, "w", encoding="utf-8") as handle:
+        for _, lines in blocks:
+            handle.writelines(lines)
+        handle.writelines(controller_lines)
+    for fragment in fragments:
+        os.remove(fragment)
+
+
+def capture_screenshot(driver, store_dir):
+    """
+    Takes a screenshot and queues it for the screenshot store
+
+    Returns:
+        Path the screenshot is stored under; identical screenshots share one file
+    """
+    png = driver.get_screenshot_as_png()
+    digest = hashlib.sha256(png).hexdigest()[:32]
+    path = os.path.join(store_dir, digest + (".jpg" if Image is not None else ".png"))
+    if path not in SCREENSHOTS_QUEUED and not os.path.exists(path):
+        SCREENSHOTS_QUEUED.add(path)
+        SCREENSHOT_WRITER.submit(store_screenshot, png, path)
+    return path
+
+
+def store_screenshot(png, path):
+    """Scales down and re-encodes a screenshot (with Pillow), then writes it atomically"""
+    try:
+        data = png
+        if Image is not None:
+            image = Image.open(io.BytesIO(png))
+            image.thumbnail(SCREENSHOT_MAX_SIZE)
+            buffer = io.BytesIO()
+            image.convert("RGB").save(buffer, "JPEG", quality=SCREENSHOT_JPEG_QUALITY, optimize=True)
+            data = buffer.getvalue()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Parallel workers may store the same screenshot; each renames a complete file
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as handle:
+            handle.write(data)
+        os.replace(temp_path, path)
+    except Exception as error:
+        logging.error(f"Could not store screenshot {path}: {error}")
+
+
+def screenshot_link(config, path):
+    """Link to a stored screenshot, relative to the HTML report when there is one"""
+    htmlpath = getattr(config.option, "htmlpath", None)
+    if not htmlpath:
+        return os.path.abspath(path)
+    return os.path.relpath(os.path.abspath(path), os.path.dirname(os.path.abspath(htmlpath))).replace(os.sep, "/")
 
 
 @pytest.hookimpl(hookwrapper=True)
@@ -38,12 +421,13 @@ def pytest_runtest_makereport(item, call):
         # Retrieve driver from the test fixture
         driver_fixture = item.funcargs.get('driver')
         if driver_fixture:
-            # Capture screenshot as a base64 string directly
-            screenshot_base64 = driver_fixture.get_screenshot_as_base64()
+            # Only the capture needs the browser; scaling and saving happen in the background
+            screenshot_file = capture_screenshot(driver_fixture, item.config.getoption("--screenshot-dir"))
 
-            logging.error("Test Failed! Embedding screenshot in report.")
+            logging.error(f"Test Failed! Screenshot saved to {screenshot_file}")
 
-            # Attach the base64 image to the report
+            # Link the stored image from the report instead of inlining it
             from pytest_html import extras
-            html = f'<div><img src="data:image/png;base64,{screenshot_base64}" alt="screenshot" style="width:600px;height:auto;" onclick="window.open(this.src)" align="right"/></div>'
+            link = screenshot_link(item.config, screenshot_file)
+            html = f'<div><a href="{link}" target="_blank"><img src="{link}" alt="screenshot" style="width:600px;height:auto;" align="right"/></a></div>'
             report.extras = [extras.html(html)]
\ No newline at end of file
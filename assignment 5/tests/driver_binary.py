@@ -0,0 +1,138 @@
+"""
+Cached Driver Binary Resolution
+Resolving a driver binary with webdriver-manager checks the installed browser
+version and asks the download site for a matching driver, every time. This
+module resolves it once, stores the path and version in a small JSON cache
+file, and returns the cached path from then on. Later tests, pytest-xdist
+workers and later runs need no version check and no network when the cache
+is warm.
+
+An exclusive file lock serializes resolution, so parallel workers that start
+with a cold cache resolve and download the binary once, not once each.
+
+Usage:
+    path = cached_driver_path("chromedriver", lambda: ChromeDriverManager().install())
+    driver = webdriver.Chrome(service=Service(path))
+"""
+
+import json
+import os
+import re
+import subprocess
+import time
+import warnings
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+# Cached paths are re-resolved after this many seconds, to pick up browser updates
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+
+DEFAULT_CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+                                 "as5-drivers")
+
+
+def cached_driver_path(name: str, install: Callable[[], str], cache_dir: str = DEFAULT_CACHE_DIR,
+                       max_age: float = DEFAULT_MAX_AGE) -> str:
+    """
+    Returns the driver binary path, resolving it with install() only if the cache has none
+
+    Args:
+        name: Cache entry name, e.g. "chromedriver"
+        install: Resolves (and downloads if needed) the binary and returns its path
+        cache_dir: Directory for the cache and lock files
+        max_age: Seconds after which a cached path is resolved again; if that
+                 fails (e.g. offline), the stale path is still used
+
+    Returns:
+        Path of an existing driver binary
+    """
+    cache_file = os.path.join(cache_dir, f"{name}.json")
+
+    # Fast path: no lock needed to read a complete cache entry
+    entry = _read_entry(cache_file)
+    if _usable(entry) and time.time() - entry['resolved_at'] < max_age:
+        return entry['path']
+
+    with _file_lock(f"{cache_file}.lock"):
+        # Another worker may have resolved it while this one waited for the lock
+        entry = _read_entry(cache_file)
+        if _usable(entry) and time.time() - entry['resolved_at'] < max_age:
+            return entry['path']
+        try:
+            path = install()
+        except Exception as error:
+            if _usable(entry):
+                warnings.warn(f"Could not re-resolve {name} ({error}); using cached {entry['path']}")
+                return entry['path']
+            raise
+        _write_entry(cache_file, {'path': path, 'version': driver_version(path), 'resolved_at': time.time()})
+        return path
+
+
+def invalidate(name: str, cache_dir: str = DEFAULT_CACHE_DIR):
+    """Drops a cache entry, e.g. after the browser rejected the cached driver's version"""
+    cache_file = os.path.join(cache_dir, f"{name}.json")
+    with _file_lock(f"{cache_file}.lock"):
+        try:
+            os.remove(cache_file)
+        except FileNotFoundError:
+            pass
+
+
+def driver_version(path: str) -> Optional[str]:
+    """Version reported by `<driver> --version`, or None if it cannot be run"""
+    try:
+        output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r"\d+(\.\d+)+", output)
+    return match.group(0) if match else None
+
+
+def _usable(entry: Optional[Dict]) -> bool:
+    return bool(entry) and os.path.isfile(entry.get('path', "")) and 'resolved_at' in entry
+
+
+def _read_entry(cache_file: str) -> Optional[Dict]:
+    try:
+        with open(cache_file, encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_entry(cache_file: str, entry: Dict):
+    # Write to a temporary file and rename, so readers never see a partial entry
+    temp_path = f"{cache_file}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(entry, handle, indent=2)
+    os.replace(temp_path, cache_file)
+
+
+@contextmanager
+def _file_lock(lock_path: str):
+    """Exclusive lock shared by all processes on this machine"""
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    with open(lock_path, "a+") as handle:
+        if os.name == "nt":
+            import msvcrt
+            handle.seek(0)
+            while True:
+                try:
+                    # Retries for about 10 seconds before raising
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
@@ -3,36 +3,181 @@
 Cross-Browser Testing with BrowserStack
 Runs login tests on multiple browsers in the cloud
 Compatible with Selenium 4.x
+
+Browsers run as concurrent sessions, at most config.MAX_PARALLEL_SESSIONS at a
+time (--max-sessions). Sessions are started in the background as soon as the
+run begins, so they come up while the test data loads. To try the runner
+against a local Selenium Grid instead of BrowserStack, pass its URL:
+
+    python automated_test_browserstack.py --hub-url http://localhost:4444/wd/hub
 """
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import openpyxl
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import argparse
+import json
+import os
+import sys
+import threading
 import time
 import config  # Import our configuration file
 
+# WebDriver command timing lives in the repository's shared helpers directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "shared"))
+from driver_metrics import CommandTimer, instrument_driver
+from driver_pool import WarmDriverPool
+from hub_connection import HubConnectionPool, hub_pool_settings
+from run_log import LOG_LEVELS, RunLogger
+from run_metrics import PROFILERS, PhaseTimer
+from run_journal import CheckpointJournal, ResultCache, exit_on_sigterm, run_state_path, scenario_fingerprint
+from scenario_loader import load_test_scenarios
+from sharding import select_shard, shard_suffix, validate_shard
+
+
+def login_outcome_shown(driver):
+    """
+    Wait condition for the response to a login attempt
+
+    Returns:
+        ("SUCCESS", message) once the success page title is shown,
+        ("FAILURE", message) once the error banner is visible, otherwise False
+    """
+    # find_elements never waits and never raises when nothing matches
+    for element in driver.find_elements(By.CSS_SELECTOR, ".post-title"):
+        if "successfully" in element.text.lower():
+            return "SUCCESS", "Logged In Successfully"
+    for element in driver.find_elements(By.ID, "error"):
+        # The banner is in the page all along; text is only non-empty while it is shown
+        message = element.text
+        if message:
+            return "FAILURE", message
+    return False
+
+
+# Scripted mode, step 1: fill the form and submit. The click is deferred so the
+# script returns before the page starts navigating away.
+FILL_AND_SUBMIT_SCRIPT = """
+const [username, password] = arguments;
+const userField = document.getElementById('username');
+const passwordField = document.getElementById('password');
+const submitButton = document.getElementById('submit');
+if (!userField || !passwordField || !submitButton) {
+    return false;
+}
+for (const [field, value] of [[userField, username], [passwordField, password]]) {
+    field.value = value;
+    field.dispatchEvent(new Event('input', {bubbles: true}));
+    field.dispatchEvent(new Event('change', {bubbles: true}));
+}
+setTimeout(() => submitButton.click(), 0);
+return true;
+"""
+
+# Scripted mode, step 2: poll for the outcome inside the page instead of over the wire.
+# Mirrors login_outcome_shown; resolves to null on timeout.
+AWAIT_OUTCOME_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const deadline = Date.now() + arguments[0];
+(function poll() {
+    const title = document.querySelector('.post-title');
+    if (title && title.textContent.toLowerCase().includes('successfully')) {
+        return done(['SUCCESS', 'Logged In Successfully']);
+    }
+    const error = document.getElementById('error');
+    if (error && error.getClientRects().length && error.innerText.trim()) {
+        return done(['FAILURE', error.innerText.trim()]);
+    }
+    if (Date.now() > deadline) {
+        return done(null);
+    }
+    setTimeout(poll, 50);
+})();
+"""
+
 
 class BrowserStackTestRunner:
     """Executes tests on BrowserStack cloud platform"""
 
-    def __init__(self):
-        self.results = []
-        self.driver = None
+    # Upper bound for page loads and for the response to a login attempt, in seconds
+    PAGE_TIMEOUT = 10
 
-    def create_driver(self, browser_config):
+    def __init__(self, resume=False, skip_unchanged=False, shard_index=0, shard_count=1,
+                 profiler=None, metrics_dir="metrics", log_level="summary", log_file=None,
+                 max_sessions=None, hub_url=None, sessions_per_browser=1, max_scenarios=3,
+                 scripted=False, hub_pool_size=None):
+        """
+        Args:
+            resume: Replay the checkpoint journal of an interrupted run
+            skip_unchanged: Reuse results of scenarios that passed before on the
+                            same browser with the same inputs and config.TARGET_VERSION
+            shard_index: 0-based shard of the scenario sheet to run
+            shard_count: Number of shards; with more than one, results are also
+                         saved to browserstack_results_shardIofN.json for merging
+            profiler: Profile every phase with "cprofile" or "sampling" (default: off)
+            metrics_dir: Directory for the per-run JSON metrics file and profiles
+            log_level: Console output: "quiet", "summary" or "verbose" (per-test steps)
+            log_file: Also write every log record to this JSON-lines file
+            max_sessions: Browser sessions running at once (default: config.MAX_PARALLEL_SESSIONS)
+            hub_url: Remote WebDriver hub; anything other than the default BrowserStack
+                     hub (e.g. a local Selenium Grid) gets plain browser options only
+            sessions_per_browser: Sessions of each browser that pull scenarios from a
+                                  shared queue until it is empty
+            max_scenarios: Scenarios to run per browser (default: 3 for the demo; None = all)
+            scripted: Fill, submit and read the outcome with two batched scripts
+                      instead of one WebDriver command per step
+            hub_pool_size: Keep-alive connections to the hub, shared by all sessions
+                           (default: config.HUB_POOL_SETTINGS, else max_sessions)
+        """
+        validate_shard(shard_index, shard_count)
+        self.results = []
+        self.max_sessions = max(1, max_sessions or config.MAX_PARALLEL_SESSIONS)
+        self.hub_url = hub_url or config.BS_HUB_URL
+        self.use_browserstack = hub_url is None
+        # All sessions send their commands over one bounded keep-alive pool per hub
+        pool_settings = hub_pool_settings(self.hub_url, config.HUB_POOL_SETTINGS)
+        pool_settings.setdefault('maxsize', self.max_sessions)
+        if hub_pool_size:
+            pool_settings['maxsize'] = hub_pool_size
+        self.hub_pool = HubConnectionPool(self.hub_url, **pool_settings)
+        self.sessions_per_browser = max(1, sessions_per_browser)
+        self.max_scenarios = max_scenarios
+        self.scripted = scripted
+        # Sessions are started ahead of time; each holds a slot from creation until quit
+        self.log = RunLogger(log_level, json_file=log_file)
+        self.driver_pool = WarmDriverPool(self._start_driver, self.max_sessions, log=self.log)
+        # Journal and result cache are shared by all session threads
+        self._state_lock = threading.Lock()
+        # One WebDriver command timer per session
+        self.command_timers = []
+        self.resume = resume
+        self.skip_unchanged = skip_unchanged
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self.journal = None
+        self.result_cache = None
+        run_name = f"browserstack_{shard_suffix(shard_index, shard_count)}" if shard_count > 1 else "browserstack"
+        self.phase_timer = PhaseTimer(run_name, profiler=profiler, output_dir=metrics_dir)
+
+    def create_driver(self, browser_config, session_name=None):
         """
         Creates a remote WebDriver connected to BrowserStack
         Compatible with Selenium 4.x using options instead of desired_capabilities
 
         Args:
             browser_config: Dictionary with browser capabilities
+            session_name: Name the session's command timings are reported under
+                          (default: the browser name)
+
+        Returns:
+            The new driver; each session owns its own
         """
-        print(f"\n{'=' * 70}")
-        print(f"Starting test on: {browser_config['sessionName']}")
-        print(f"{'=' * 70}")
+        self.log.info(f"\n{'=' * 70}\nStarting test on: {browser_config['sessionName']}\n{'=' * 70}")
 
         # Determine which browser to use and create appropriate options
         browser_name = browser_config['browserName'].lower()
@@ -54,97 +199,105 @@ class BrowserStackTestRunner:
             from selenium.webdriver.chrome.options import Options
             options = Options()
 
-        # Set browser-specific capabilities
-        options.browser_version = browser_config.get('browserVersion', 'latest')
-        options.platform_name = browser_config['os']
-
-        # Add BrowserStack specific options
-        bstack_options = {
-            'os': browser_config['os'],
-            'osVersion': browser_config['osVersion'],
-            'sessionName': browser_config['sessionName'],
-            'buildName': browser_config['buildName'],
-            'local': False,
-            'seleniumVersion': '4.0.0',
-            'debug': True,
-            'video': True,
-            'networkLogs': True,
-            'consoleLogs': 'info'
-        }
-
-        options.set_capability('bstack:options', bstack_options)
+        # Platform and BrowserStack capabilities would not match any node of a local grid
+        if self.use_browserstack:
+            # Set browser-specific capabilities
+            options.browser_version = browser_config.get('browserVersion', 'latest')
+            options.platform_name = browser_config['os']
+
+            # Add BrowserStack specific options
+            bstack_options = {
+                'os': browser_config['os'],
+                'osVersion': browser_config['osVersion'],
+                'sessionName': browser_config['sessionName'],
+                'buildName': browser_config['buildName'],
+                'local': False,
+                'seleniumVersion': '4.0.0',
+                'debug': True,
+                'video': True,
+                'networkLogs': True,
+                'consoleLogs': 'info'
+            }
+
+            options.set_capability('bstack:options', bstack_options)
 
         # Create remote driver
-        self.driver = webdriver.Remote(
-            command_executor=config.BS_HUB_URL,
+        driver = webdriver.Remote(
+            command_executor=self.hub_pool.connection(),
             options=options
         )
 
-        self.driver.implicitly_wait(10)
-        return self.driver
+        # No implicit wait: every lookup that may legitimately miss would block for it.
+        # Pages are waited for explicitly instead.
+        self.command_timers.append(instrument_driver(driver, session_name or browser_config['name']))
+        if self.scripted:
+            # The outcome script waits in the page for up to PAGE_TIMEOUT
+            driver.set_script_timeout(self.PAGE_TIMEOUT + 5)
+        return driver
+
+    def _start_driver(self, browser_config, session_name):
+        """Creates a driver for the warm pool, timed as driver creation"""
+        with self.phase_timer.phase("driver_creation"):
+            return self.create_driver(browser_config, session_name=session_name)
+
+    def _planned_sessions(self):
+        """
+        Sessions to start before the scenarios are known: sessions_per_browser
+        per browser, but no more than the scenarios each browser may run
+
+        Returns:
+            (browser_config, session name) pairs, browser by browser
+        """
+        session_count = self.sessions_per_browser
+        if self.max_scenarios:
+            session_count = min(session_count, self.max_scenarios)
+        sessions = []
+        for browser_config in config.BROWSER_CONFIGS:
+            name = browser_config['name']
+            if session_count == 1:
+                sessions.append((browser_config, name))
+            else:
+                sessions.extend((browser_config, f"{name}#{number}") for number in range(1, session_count + 1))
+        return sessions
 
-    def run_login_test(self, username, password, expected_outcome):
+    def run_login_test(self, driver, username, password, expected_outcome, label=""):
         """
         Executes a single login test
 
         Args:
+            driver: WebDriver of the session running the test
             username: Username to test
             password: Password to test
             expected_outcome: Expected result (SUCCESS or FAILURE)
+            label: Session name prefixed to log lines, as sessions run concurrently
 
         Returns:
             Dictionary with test results
         """
+        started = time.perf_counter()
+        timer = getattr(driver, 'command_timer', None)
+        commands_before = timer.command_count if timer else 0
         try:
             # Navigate to login page
-            print(f"  → Navigating to login page...")
-            self.driver.get("https://practicetestautomation.com/practice-test-login/")
+            self.log.detail(f"  [{label}] → Navigating to login page...")
+            driver.get("https://practicetestautomation.com/practice-test-login/")
 
-            # Wait for page to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, "username"))
-            )
+            self.log.detail(f"  [{label}] → Testing credentials: [{username}] / [{'*' * len(password)}]")
+            if self.scripted:
+                outcome = self._scripted_login(driver, username, password)
+            else:
+                outcome = self._interactive_login(driver, username, password)
 
-            print(f"  → Testing credentials: [{username}] / [{'*' * len(password)}]")
-
-            # Find and fill username field
-            username_field = self.driver.find_element(By.ID, "username")
-            username_field.clear()
-            username_field.send_keys(username)
-
-            # Find and fill password field
-            password_field = self.driver.find_element(By.ID, "password")
-            password_field.clear()
-            password_field.send_keys(password)
-
-            # Click submit button
-            submit_button = self.driver.find_element(By.ID, "submit")
-            submit_button.click()
-
-            # Wait for response
-            time.sleep(2)
-
-            # Check for success or failure
-            actual_outcome = "FAILURE"
-            actual_message = ""
-
-            try:
-                # Check for success message
-                success_element = self.driver.find_element(By.CSS_SELECTOR, ".post-title")
-                if "Logged In Successfully" in success_element.text or "successfully" in success_element.text.lower():
-                    actual_outcome = "SUCCESS"
-                    actual_message = "Logged In Successfully"
-                    print(f"  ✓ Login successful")
-            except:
-                # Check for error message
-                try:
-                    error_element = self.driver.find_element(By.ID, "error")
-                    actual_message = error_element.text
-                    actual_outcome = "FAILURE"
-                    print(f"  ✗ Login failed: {actual_message}")
-                except:
-                    actual_message = "Unknown response"
-                    print(f"  ? Unknown response from application")
+            if outcome is None:
+                actual_outcome = "FAILURE"
+                actual_message = "Unknown response"
+                self.log.detail(f"  [{label}] ? Unknown response from application")
+            else:
+                actual_outcome, actual_message = outcome
+                if actual_outcome == "SUCCESS":
+                    self.log.detail(f"  [{label}] ✓ Login successful")
+                else:
+                    self.log.detail(f"  [{label}] ✗ Login failed: {actual_message}")
 
             # Determine if test passed
             test_passed = (actual_outcome == expected_outcome)
@@ -155,155 +308,413 @@ class BrowserStackTestRunner:
                 'actual': actual_outcome,
                 'message': actual_message,
                 'passed': test_passed,
-                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'duration': time.perf_counter() - started,
+                'commands': (timer.command_count - commands_before) if timer else None
             }
 
             if test_passed:
-                print(f"  ✓ Test PASSED")
+                self.log.detail(f"  [{label}] ✓ Test PASSED")
             else:
-                print(f"  ✗ Test FAILED (Expected: {expected_outcome}, Got: {actual_outcome})")
+                self.log.detail(f"  [{label}] ✗ Test FAILED (Expected: {expected_outcome}, Got: {actual_outcome})")
 
             return result
 
         except Exception as e:
-            print(f"  ✗ Error during test: {str(e)}")
+            self.log.error(f"  [{label}] ✗ Error during test: {str(e)}")
             return {
                 'username': username,
                 'expected': expected_outcome,
                 'actual': 'ERROR',
                 'message': str(e),
                 'passed': False,
-                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'duration': time.perf_counter() - started,
+                'commands': (timer.command_count - commands_before) if timer else None
             }
 
+    def _interactive_login(self, driver, username, password):
+        """
+        Fills and submits the form one WebDriver command at a time
+
+        Returns:
+            (outcome, message), or None if neither indicator appeared in time
+        """
+        # Wait for page to load
+        WebDriverWait(driver, self.PAGE_TIMEOUT).until(
+            EC.presence_of_element_located((By.ID, "username"))
+        )
+
+        # Find and fill username field
+        username_field = driver.find_element(By.ID, "username")
+        username_field.clear()
+        username_field.send_keys(username)
+
+        # Find and fill password field
+        password_field = driver.find_element(By.ID, "password")
+        password_field.clear()
+        password_field.send_keys(password)
+
+        # Click submit button
+        submit_button = driver.find_element(By.ID, "submit")
+        submit_button.click()
+
+        return self._wait_for_outcome(driver)
+
+    def _scripted_login(self, driver, username, password):
+        """
+        Fills, submits and reads the outcome with two script executions
+
+        Returns:
+            (outcome, message), or None if neither indicator appeared in time
+        """
+        if not driver.execute_script(FILL_AND_SUBMIT_SCRIPT, username, password):
+            raise RuntimeError("Login form not found on the page")
+        try:
+            outcome = driver.execute_async_script(AWAIT_OUTCOME_SCRIPT, self.PAGE_TIMEOUT * 1000)
+        except WebDriverException:
+            # The script was cut off by the navigation to the success page
+            return self._wait_for_outcome(driver)
+        return tuple(outcome) if outcome else None
+
+    def _wait_for_outcome(self, driver):
+        """Polls for either login indicator; returns (outcome, message) or None on timeout"""
+        try:
+            return WebDriverWait(
+                driver, self.PAGE_TIMEOUT, poll_frequency=0.2,
+                ignored_exceptions=(StaleElementReferenceException,)
+            ).until(login_outcome_shown)
+        except TimeoutException:
+            return None
+
     def execute_test_suite_on_browser(self, browser_config, test_scenarios):
         """
         Runs all test scenarios on a specific browser
 
+        Scenarios go into a shared queue that sessions_per_browser sessions drain
+        concurrently, so one slow scenario only holds up its own session.
+
         Args:
             browser_config: Browser configuration dictionary
             test_scenarios: List of test scenarios from Excel
+
+        Returns:
+            Results in scenario order
+        """
+        name = browser_config['name']
+
+        if self.max_scenarios is not None:
+            test_scenarios = test_scenarios[:self.max_scenarios]
+        version = f"{config.TARGET_VERSION}|{name}"
+        keys = [scenario_fingerprint(scenario, version) for scenario in test_scenarios]
+
+        # Reused results fill their slots up front; everything else is queued
+        results = [self._lookup_reused(key) for key in keys]
+        work = deque((position, scenario, key)
+                     for position, (scenario, key, reused) in enumerate(zip(test_scenarios, keys, results))
+                     if reused is None)
+        for position, reused in enumerate(results):
+            if reused is not None:
+                self.log.detail(f"  [{name}] ↺ {test_scenarios[position]['ScenarioDescription']}: reusing earlier "
+                                f"result: {'PASSED' if reused['passed'] else 'FAILED'}")
+
+        # Warm sessions this browser has no work for are given back right away
+        session_count = min(self.sessions_per_browser, len(work))
+        self.driver_pool.discard(name, keep=session_count)
+        if session_count == 1:
+            self._run_session(browser_config, work, results, len(test_scenarios))
+        elif session_count > 1:
+            with ThreadPoolExecutor(max_workers=session_count, thread_name_prefix=f"{name}-session") as pool:
+                sessions = [pool.submit(self._run_session, browser_config, work, results, len(test_scenarios))
+                            for _ in range(session_count)]
+                for session in sessions:
+                    session.result()
+
+        # Scenarios left in the queue after every session failed have no result
+        return [result for result in results if result is not None]
+
+    def _run_session(self, browser_config, work, results, num_tests):
         """
-        browser_results = []
+        One browser session: takes a warm driver from the pool and pulls
+        scenarios from the shared queue until it is empty
 
-        try:
-            # Create driver for this browser
-            self.create_driver(browser_config)
+        Args:
+            browser_config: Browser configuration dictionary
+            work: Shared deque of (position, scenario, fingerprint key)
+            results: Shared result list, filled in at each scenario's position
+            num_tests: Scenarios for this browser, for progress messages
+        """
+        driver = None
+        label = browser_config['name']
 
-            # Run each test scenario (first 3 tests for demo)
-            num_tests = min(3, len(test_scenarios))
-            for i, scenario in enumerate(test_scenarios[:num_tests], 1):
-                print(f"\n  Test {i}/{num_tests}: {scenario['ScenarioDescription']}")
+        try:
+            # Usually started long ago; otherwise it is still waiting for a slot
+            with self.phase_timer.phase("driver_wait"):
+                session = self.driver_pool.acquire(browser_config['name'])
+            if session is None:
+                return
+            driver, label = session
+
+            # While this session was starting, its siblings may have drained the queue
+            if not work:
+                return
+
+            with self.phase_timer.phase("scenario_execution"):
+                while True:
+                    try:
+                        position, scenario, key = work.popleft()
+                    except IndexError:
+                        break
+                    self.log.detail(f"\n  [{label}] Test {position + 1}/{num_tests}: "
+                                    f"{scenario['ScenarioDescription']}")
+
+                    result = self.run_login_test(
+                        driver,
+                        username=scenario['InputUsername'],
+                        password=scenario['InputPassword'],
+                        expected_outcome=scenario['ExpectedOutcome'],
+                        label=label
+                    )
 
-                result = self.run_login_test(
-                    username=scenario['InputUsername'],
-                    password=scenario['InputPassword'],
-                    expected_outcome=scenario['ExpectedOutcome']
-                )
+                    # A dead session would fail every scenario it takes: hand this one
+                    # back to the live sessions and stop taking work. If none is left,
+                    # it stays without an outcome for --resume.
+                    if result['actual'] == 'ERROR' and not self._session_alive(driver):
+                        work.appendleft((position, scenario, key))
+                        self.log.error(f"\n✗ [{label}] Session lost; returning its scenario to the queue")
+                        return
 
-                result['browser'] = browser_config['name']
-                result['test_id'] = scenario['TestCaseID']
-                browser_results.append(result)
+                    result['browser'] = browser_config['name']
+                    result['test_id'] = scenario['TestCaseID']
+                    results[position] = result
+                    self._checkpoint(key, result)
+                    self.log.event("scenario", dict(result))
 
-                time.sleep(1)  # Small delay between tests
+            if not self.use_browserstack:
+                return
 
             # Mark test as passed in BrowserStack
-            self.driver.execute_script(
+            driver.execute_script(
                 'browserstack_executor: {"action": "setSessionStatus", '
                 '"arguments": {"status":"passed", "reason": "All tests completed"}}'
             )
 
         except Exception as e:
-            print(f"\n✗ Error during test execution: {str(e)}")
-            if self.driver:
+            self.log.error(f"\n✗ [{label}] Error during test execution: {str(e)}")
+            if driver and self.use_browserstack:
                 try:
-                    self.driver.execute_script(
+                    driver.execute_script(
                         'browserstack_executor: {"action": "setSessionStatus", '
                         '"arguments": {"status":"failed", "reason": "' + str(e).replace('"', "'") + '"}}'
                     )
                 except:
                     pass
         finally:
-            if self.driver:
-                print(f"\n  Closing browser...")
-                self.driver.quit()
-
-        return browser_results
+            if driver:
+                self.log.info(f"\n  [{label}] Closing browser...")
+                with self.phase_timer.phase("driver_teardown"):
+                    self.driver_pool.release(driver)
+
+    @staticmethod
+    def _session_alive(driver):
+        """True if the hub still answers commands for this driver's session"""
+        try:
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def _lookup_reused(self, key):
+        """Returns a journaled or cached result for this scenario/browser, if any"""
+        with self._state_lock:
+            return self._lookup_reused_locked(key)
+
+    def _lookup_reused_locked(self, key):
+        if self.journal:
+            reused = self.journal.lookup(key)
+            if reused is not None:
+                if self.result_cache:
+                    self.result_cache.store(key, *reused, passed=reused[0]['passed'])
+                return reused[0]
+        if self.result_cache:
+            reused = self.result_cache.lookup(key)
+            if reused is not None:
+                self.journal.record(key, *reused)
+                return reused[0]
+        return None
+
+    def _checkpoint(self, key, result):
+        """Journals a finished scenario and updates the result cache"""
+        # An ERROR is a broken session or hub, not an outcome: --resume must run it again
+        if result['actual'] == 'ERROR':
+            return
+        with self._state_lock:
+            self.journal.record(key, result, result['message'])
+            if self.result_cache:
+                self.result_cache.store(key, result, result['message'], result['passed'])
 
     def run_all_tests(self):
         """Main method to execute tests on all configured browsers"""
 
-        print("\n" + "=" * 70)
-        print("CROSS-BROWSER TESTING WITH BROWSERSTACK")
-        print("=" * 70)
-        print(f"Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Target: https://practicetestautomation.com/practice-test-login/")
-        print(f"Browsers: {len(config.BROWSER_CONFIGS)}")
-        print("=" * 70)
+        self.log.info("\n" + "=" * 70)
+        self.log.info("CROSS-BROWSER TESTING WITH BROWSERSTACK")
+        self.log.info("=" * 70)
+        self.log.info(f"Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        self.log.info(f"Target: https://practicetestautomation.com/practice-test-login/")
+        self.log.info(f"Browsers: {len(config.BROWSER_CONFIGS)} ({self.max_sessions} parallel sessions)")
+        self.log.info("=" * 70)
 
-        # Load test scenarios from Excel
-        print("\n📊 Loading test data from Excel...")
+        # Sessions start now and come up while the scenarios load
+        self.driver_pool.start(self._planned_sessions())
         try:
-            wb = openpyxl.load_workbook('test_data.xlsx')
-            ws = wb['LoginTestScenarios']
-
-            # Read test scenarios
-            test_scenarios = []
-            headers = [cell.value for cell in ws[1]]
+            self._run_all_browsers()
+        finally:
+            self.driver_pool.close()
+            self.hub_pool.close()
 
-            for row_idx in range(2, ws.max_row + 1):
-                scenario = {}
-                for col_idx, header in enumerate(headers, 1):
-                    scenario[header] = ws.cell(row_idx, col_idx).value or ""
-                test_scenarios.append(scenario)
+    def _run_all_browsers(self):
+        """Loads the scenarios, runs every browser and reports; called with the pool started"""
 
-            wb.close()
-            print(f"✓ Loaded {len(test_scenarios)} test scenarios")
+        # Load test scenarios from Excel
+        self.log.info("\n📊 Loading test data from Excel...")
+        try:
+            with self.phase_timer.phase("data_loading"):
+                test_scenarios = load_test_scenarios('test_data.xlsx', 'LoginTestScenarios')
+                self.log.info(f"✓ Loaded {len(test_scenarios)} test scenarios")
+                if self.shard_count > 1:
+                    test_scenarios = list(select_shard(test_scenarios, self.shard_index, self.shard_count))
+                    self.log.info(f"✓ {len(test_scenarios)} scenarios belong to shard "
+                                  f"{self.shard_index + 1} of {self.shard_count}")
 
         except Exception as e:
-            print(f"✗ Error loading Excel file: {e}")
+            self.log.error(f"✗ Error loading Excel file: {e}")
             return
 
-        # Execute tests on each browser
+        # Checkpoint journal (always written) and optional result cache, kept per shard
+        state_prefix = f"{shard_suffix(self.shard_index, self.shard_count)}." if self.shard_count > 1 else ""
+        self.journal = CheckpointJournal(
+            run_state_path('test_data.xlsx', 'LoginTestScenarios', f'browserstack.{state_prefix}journal.jsonl'),
+            resume=self.resume
+        )
+        if self.journal.entries:
+            self.log.info(f"✓ Resuming: {len(self.journal.entries)} scenarios already finished in the journal")
+        if self.skip_unchanged:
+            self.result_cache = ResultCache(
+                run_state_path('test_data.xlsx', 'LoginTestScenarios', f'browserstack.{state_prefix}results-cache.json')
+            )
+
+        # Execute tests on all browsers concurrently; the driver pool caps the
+        # number of live sessions, so every browser gets its own thread
         all_results = []
 
-        for i, browser_config in enumerate(config.BROWSER_CONFIGS, 1):
-            print(f"\n{'#' * 70}")
-            print(f"BROWSER {i}/{len(config.BROWSER_CONFIGS)}: {browser_config['name']}")
-            print(f"{'#' * 70}")
+        with ThreadPoolExecutor(max_workers=len(config.BROWSER_CONFIGS) or 1,
+                                thread_name_prefix="session") as pool:
+            futures = []
+            for i, browser_config in enumerate(config.BROWSER_CONFIGS, 1):
+                self.log.info(f"\n{'#' * 70}")
+                self.log.info(f"BROWSER {i}/{len(config.BROWSER_CONFIGS)}: {browser_config['name']}")
+                self.log.info(f"{'#' * 70}")
+                futures.append(pool.submit(self.execute_test_suite_on_browser, browser_config, test_scenarios))
+
+            # Collect in configuration order, so merged results do not depend on timing
+            for browser_config, future in zip(config.BROWSER_CONFIGS, futures):
+                browser_results = future.result()
+                all_results.extend(browser_results)
+
+                self.log.info(f"\n✓ Completed testing on {browser_config['name']}")
+                self.log.info(f"  Tests run: {len(browser_results)}")
+                self.log.info(f"  Passed: {sum(1 for r in browser_results if r['passed'])}")
+                self.log.info(f"  Failed: {sum(1 for r in browser_results if not r['passed'])}")
+
+        # The journal is only done with once every planned scenario has an outcome
+        planned = len(test_scenarios if self.max_scenarios is None else test_scenarios[:self.max_scenarios])
+        unfinished = planned * len(config.BROWSER_CONFIGS) - sum(1 for r in all_results if r['actual'] != 'ERROR')
+        if unfinished:
+            self.journal.close()
+            self.log.info(f"\n↺ {unfinished} scenarios have no outcome; run again with --resume to retry only those")
+        else:
+            self.journal.complete()
+        if self.result_cache:
+            self.result_cache.save()
+
+        # Save this shard's results so they can be merged later
+        if self.shard_count > 1:
+            shard_file = f"browserstack_results_{shard_suffix(self.shard_index, self.shard_count)}.json"
+            with self.phase_timer.phase("results_save"):
+                with open(shard_file, 'w', encoding='utf-8') as handle:
+                    json.dump(all_results, handle, ensure_ascii=False, indent=2)
+            self.log.info(f"\n✓ Shard results saved to {shard_file}")
 
-            browser_results = self.execute_test_suite_on_browser(
-                browser_config,
-                test_scenarios
-            )
+        # Display summary
+        with self.phase_timer.phase("summary"):
+            self.display_summary(all_results)
+
+        self.log.info("\nTIME BY PHASE:")
+        self.log.info("\n".join(self.phase_timer.summary_lines()))
+        all_commands = CommandTimer.merge(self.command_timers)
+        if all_commands.command_count:
+            self.log.info("\nWEBDRIVER COMMAND LATENCY (all sessions):")
+            self.log.info("\n".join(all_commands.summary_lines()))
+        hub_connections = self.hub_pool.stats()
+        self.log.info(f"\nHUB CONNECTIONS: {hub_connections['requests']} requests, "
+                      f"{hub_connections['new']} new connections, {hub_connections['reused']} reused "
+                      f"(pool size {self.hub_pool.maxsize})")
+        metrics_file = self.phase_timer.export({
+            'browsers': [browser_config['name'] for browser_config in config.BROWSER_CONFIGS],
+            'shard_index': self.shard_index,
+            'shard_count': self.shard_count,
+            'total_tests': len(all_results),
+            'passed': sum(1 for r in all_results if r['passed']),
+            'failed': sum(1 for r in all_results if not r['passed']),
+            'webdriver_commands': {
+                'all': all_commands.to_dict(),
+                'sessions': [timer.to_dict() for timer in self.command_timers]
+            },
+            'hub_connections': dict(hub_connections, pool_size=self.hub_pool.maxsize)
+        })
+        self.log.info(f"✓ Run metrics written to {metrics_file}")
+
+        self.log.info("\n" + "=" * 70)
+        self.log.info("🎉 ALL TESTS COMPLETED!")
+        self.log.info("=" * 70)
+        self.log.info("\n📋 NEXT STEPS:")
+        self.log.info("1. Go to BrowserStack dashboard: https://automate.browserstack.com/")
+        self.log.info("2. View your test sessions")
+        self.log.info("3. Download screenshots and videos")
+        self.log.info("4. Download execution logs")
+        self.log.info("5. Include these in your report")
+        self.log.info("\n")
+        self.log.flush()
+
+    def merge_shard_results(self, result_files, output_file="browserstack_results.json"):
+        """
+        Combines per-shard result files into one summary and one merged result file
 
-            all_results.extend(browser_results)
+        Args:
+            result_files: JSON files written by sharded runs
+            output_file: JSON file the combined results are written to
+        """
+        all_results = []
+        for result_file in result_files:
+            with open(result_file, encoding='utf-8') as handle:
+                shard_results = json.load(handle)
+            self.log.info(f"✓ {result_file}: {len(shard_results)} results")
+            all_results.extend(shard_results)
 
-            print(f"\n✓ Completed testing on {browser_config['name']}")
-            print(f"  Tests run: {len(browser_results)}")
-            print(f"  Passed: {sum(1 for r in browser_results if r['passed'])}")
-            print(f"  Failed: {sum(1 for r in browser_results if not r['passed'])}")
+        with open(output_file, 'w', encoding='utf-8') as handle:
+            json.dump(all_results, handle, ensure_ascii=False, indent=2)
+        self.log.info(f"✓ Merged results saved to {output_file}")
 
-        # Display summary
         self.display_summary(all_results)
-
-        print("\n" + "=" * 70)
-        print("🎉 ALL TESTS COMPLETED!")
-        print("=" * 70)
-        print("\n📋 NEXT STEPS:")
-        print("1. Go to BrowserStack dashboard: https://automate.browserstack.com/")
-        print("2. View your test sessions")
-        print("3. Download screenshots and videos")
-        print("4. Download execution logs")
-        print("5. Include these in your report")
-        print("\n")
+        self.log.flush()
+        return all_results
 
     def display_summary(self, results):
         """Display summary of all test results"""
 
-        print("\n" + "=" * 70)
-        print("TEST EXECUTION SUMMARY")
-        print("=" * 70)
+        self.log.info("\n" + "=" * 70)
+        self.log.info("TEST EXECUTION SUMMARY")
+        self.log.info("=" * 70)
 
         # Group by browser
         browsers = {}
@@ -319,16 +730,16 @@ class BrowserStackTestRunner:
             failed = len(browser_results) - passed
             pass_rate = (passed / len(browser_results) * 100) if browser_results else 0
 
-            print(f"\n{browser}:")
-            print(f"  Total Tests: {len(browser_results)}")
-            print(f"  Passed: {passed}")
-            print(f"  Failed: {failed}")
-            print(f"  Pass Rate: {pass_rate:.1f}%")
+            self.log.info(f"\n{browser}:")
+            self.log.info(f"  Total Tests: {len(browser_results)}")
+            self.log.info(f"  Passed: {passed}")
+            self.log.info(f"  Failed: {failed}")
+            self.log.info(f"  Pass Rate: {pass_rate:.1f}%")
 
             # Show individual results
             for result in browser_results:
                 status = "✓ PASS" if result['passed'] else "✗ FAIL"
-                print(f"    {result['test_id']}: {status} - {result['username']}")
+                self.log.detail(f"    {result['test_id']}: {status} - {result['username']}")
 
         # Overall summary
         total_tests = len(results)
@@ -336,20 +747,70 @@ class BrowserStackTestRunner:
         total_failed = total_tests - total_passed
         overall_pass_rate = (total_passed / total_tests * 100) if total_tests else 0
 
-        print(f"\n{'─' * 70}")
-        print("OVERALL SUMMARY:")
-        print(f"  Total Tests Across All Browsers: {total_tests}")
-        print(f"  Total Passed: {total_passed}")
-        print(f"  Total Failed: {total_failed}")
-        print(f"  Overall Pass Rate: {overall_pass_rate:.1f}%")
-        print("=" * 70)
+        self.log.info(f"\n{'─' * 70}")
+        self.log.info("OVERALL SUMMARY:")
+        self.log.info(f"  Total Tests Across All Browsers: {total_tests}")
+        self.log.info(f"  Total Passed: {total_passed}")
+        self.log.info(f"  Total Failed: {total_failed}")
+        self.log.info(f"  Overall Pass Rate: {overall_pass_rate:.1f}%")
+        # Reused and merged results from older runs may lack a duration
+        durations = [r['duration'] for r in results if r.get('duration') is not None]
+        if durations:
+            self.log.info(f"  Average Scenario Time: {sum(durations) / len(durations):.2f}s "
+                          f"(max {max(durations):.2f}s)")
+        commands = [r['commands'] for r in results if r.get('commands')]
+        if commands:
+            self.log.info(f"  Average WebDriver Commands per Scenario: {sum(commands) / len(commands):.1f}")
+        self.log.info("=" * 70)
 
 
 def main():
     """Main entry point"""
 
+    parser = argparse.ArgumentParser(description="Cross-browser login tests on BrowserStack")
+    parser.add_argument("--resume", action="store_true",
+                        help="Resume an interrupted run from its checkpoint journal")
+    parser.add_argument("--skip-unchanged", action="store_true",
+                        help="Reuse results of scenarios that passed before on the same browser")
+    parser.add_argument("--shard-index", type=int, default=0,
+                        help="0-based shard of the sheet to run (default: 0)")
+    parser.add_argument("--shard-count", type=int, default=1,
+                        help="Number of shards the sheet is split into (default: 1)")
+    parser.add_argument("--merge", nargs="+", metavar="RESULTS_FILE",
+                        help="Merge per-shard result files into one summary and one result file")
+    parser.add_argument("--merge-output", default="browserstack_results.json",
+                        help="Result file written by --merge (default: browserstack_results.json)")
+    parser.add_argument("--profile", choices=PROFILERS, default=None,
+                        help="Profile each run phase with cProfile or the sampling profiler")
+    parser.add_argument("--metrics-dir", default="metrics",
+                        help="Directory for the per-run JSON metrics file (default: metrics)")
+    parser.add_argument("--log-level", choices=LOG_LEVELS, default="summary",
+                        help="Console output: quiet, summary (default) or verbose with every test step")
+    parser.add_argument("--log-file", default=None,
+                        help="Also write structured log records to this JSON-lines file")
+    parser.add_argument("--max-sessions", type=int, default=config.MAX_PARALLEL_SESSIONS,
+                        help=f"Browser sessions running in parallel (default: {config.MAX_PARALLEL_SESSIONS})")
+    parser.add_argument("--sessions-per-browser", type=int, default=1,
+                        help="Sessions per browser pulling scenarios from a shared queue (default: 1)")
+    parser.add_argument("--max-scenarios", type=int, default=3,
+                        help="Scenarios to run per browser (default: 3; 0 runs the whole sheet)")
+    parser.add_argument("--scripted", action="store_true",
+                        help="Fill, submit and read each login with two batched scripts instead of ~10 commands")
+    parser.add_argument("--hub-url", default=None,
+                        help="Run against this WebDriver hub (e.g. a local Selenium Grid) instead of BrowserStack")
+    parser.add_argument("--hub-pool-size", type=int, default=None,
+                        help="Keep-alive connections to the hub shared by all sessions "
+                             "(default: config.HUB_POOL_SETTINGS, else --max-sessions)")
+    args = parser.parse_args()
+    exit_on_sigterm()
+
+    if args.merge:
+        BrowserStackTestRunner(log_level=args.log_level,
+                               log_file=args.log_file).merge_shard_results(args.merge, args.merge_output)
+        return
+
     # Verify credentials are configured
-    if config.BS_USERNAME == "yourname_abc123" or config.BS_ACCESS_KEY == "aBcDeFgHiJkLmNoPqRsT":
+    if args.hub_url is None and (config.BS_USERNAME == "yourname_abc123" or config.BS_ACCESS_KEY == "aBcDeFgHiJkLmNoPqRsT"):
         print("\n❌ ERROR: Please configure your BrowserStack credentials in config.py")
         print("\nSteps:")
         print("1. Open config.py")
@@ -360,7 +821,14 @@ def main():
         return
 
     # Create and run test runner
-    runner = BrowserStackTestRunner()
+    runner = BrowserStackTestRunner(resume=args.resume, skip_unchanged=args.skip_unchanged,
+                                    shard_index=args.shard_index, shard_count=args.shard_count,
+                                    profiler=args.profile, metrics_dir=args.metrics_dir,
+                                    log_level=args.log_level, log_file=args.log_file,
+                                    max_sessions=args.max_sessions, hub_url=args.hub_url,
+                                    sessions_per_browser=args.sessions_per_browser,
+                                    max_scenarios=args.max_scenarios or None,
+                                    scripted=args.scripted, hub_pool_size=args.hub_pool_size)
     runner.run_all_tests()
 
 
@@ -1,151 +1,263 @@
 
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Tuple
+import argparse
+import asyncio
+import functools
+import json
+import math
+import os
+import random
+import re
+import threading
 import time
 import sys
 
+# Percentile helper lives in the repository's shared helpers directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "shared"))
+from latency_stats import percentiles
+from run_log import LOG_LEVELS, RunLogger
+from run_metrics import PROFILERS, PhaseTimer
+from run_journal import CheckpointJournal, ResultCache, exit_on_sigterm, run_state_path, scenario_fingerprint
+from scenario_loader import load_test_scenarios, refresh_cache
+from sharding import select_shard, shard_suffix, validate_shard
+
+
+# Shared styles for result cells
+RESULT_HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+RESULT_HEADER_FONT = Font(bold=True, color="FFFFFF", size=11)
+RESULT_HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='center')
+PASSED_FILL = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
+FAILED_FILL = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+
+RESULT_COLUMNS = ['ActualOutcome', 'ActualMessage', 'TestResult', 'ExecutionTime']
+# Separate results workbooks also carry what a shard merge needs for latency statistics
+RESULT_WORKBOOK_COLUMNS = ['TestCaseID'] + RESULT_COLUMNS + ['TestCategory', 'DurationSeconds']
+
 
 class TestExecutionTracker:
 
-    def __init__(self):
+    LATENCY_PERCENTILES = (50, 90, 99)
+
+    def __init__(self, keep_outcomes: bool = True):
+        """
+        Args:
+            keep_outcomes: Keep per-test details for the detailed report.
+                           Streaming runs only keep the counters.
+        """
         self.execution_start_time = datetime.now()
+        self._start_counter = time.perf_counter()
+        self.keep_outcomes = keep_outcomes
         self.test_outcomes = []
         self.total_assertions = 0
         self.passed_assertions = 0
+        # Per-category scenario durations in seconds, packed as C doubles
+        self.durations_by_category = {}
+        self._lock = threading.Lock()
 
-    def record_outcome(self, test_id: str, status: str, details: str):
-        """Records individual test result"""
-        self.test_outcomes.append({
-            'id': test_id,
-            'status': status,
-            'details': details,
-            'timestamp': datetime.now()
-        })
-        self.total_assertions += 1
-        if status == "PASSED":
-            self.passed_assertions += 1
+    def record_outcome(self, test_id: str, status: str, details: str,
+                       category: str = "General", duration: float = None):
+        """
+        Records individual test result (safe to call from worker threads)
 
-    def generate_summary_report(self) -> str:
-        """Creates formatted summary of test execution"""
-        duration = (datetime.now() - self.execution_start_time).total_seconds()
+        Args:
+            category: Scenario class the duration is aggregated under
+            duration: Scenario wall time in seconds, measured with time.perf_counter()
+        """
+        with self._lock:
+            if self.keep_outcomes:
+                self.test_outcomes.append({
+                    'id': test_id,
+                    'status': status,
+                    'details': details,
+                    'timestamp': datetime.now()
+                })
+            self.total_assertions += 1
+            if status == "PASSED":
+                self.passed_assertions += 1
+            if duration is not None:
+                durations = self.durations_by_category.get(category)
+                if durations is None:
+                    durations = self.durations_by_category[category] = array('d')
+                durations.append(duration)
+
+    def latency_statistics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarizes scenario durations per category (plus an "ALL" row)
+
+        Returns: {category: {'count', 'p50', 'p90', 'p99', 'max', 'total'}} in seconds
+        """
+        with self._lock:
+            samples = {category: sorted(durations) for category, durations in self.durations_by_category.items()}
+
+        if samples:
+            samples['ALL'] = sorted(value for durations in samples.values() for value in durations)
+
+        statistics = {}
+        for category, ordered in samples.items():
+            entry = {'count': len(ordered)}
+            entry.update(percentiles(ordered, self.LATENCY_PERCENTILES))
+            entry['max'] = ordered[-1]
+            entry['total'] = sum(ordered)
+            statistics[category] = entry
+        return statistics
+
+    def generate_summary_report(self, include_duration: bool = True) -> str:
+        """
+        Creates formatted summary of test execution
+
+        Args:
+            include_duration: Report this tracker's wall time (off when the
+                              outcomes were recorded from earlier runs)
+        """
+        duration = time.perf_counter() - self._start_counter
         pass_rate = (self.passed_assertions / self.total_assertions * 100) if self.total_assertions > 0 else 0
 
-        summary = f"""
-    Execution Duration: {duration:.2f} seconds                   
-    Total Test Cases: {self.total_assertions}                    
+        summary = "\n"
+        if include_duration:
+            summary += f"    Execution Duration: {duration:.2f} seconds                   \n"
+        summary += f"""    Total Test Cases: {self.total_assertions}                    
     Passed: {self.passed_assertions}                             
     Failed: {self.total_assertions - self.passed_assertions}     
     Pass Rate: {pass_rate:.1f}%                                  
 """
+        statistics = self.latency_statistics()
+        if statistics:
+            summary += "\n    Scenario Latency (ms):\n"
+            summary += f"    {'Category':<14}{'Count':>8}{'p50':>10}{'p90':>10}{'p99':>10}{'Max':>10}{'Total s':>10}\n"
+            for category, entry in statistics.items():
+                summary += (f"    {category:<14}{entry['count']:>8}"
+                            f"{entry['p50'] * 1000:>10.1f}{entry['p90'] * 1000:>10.1f}"
+                            f"{entry['p99'] * 1000:>10.1f}{entry['max'] * 1000:>10.1f}"
+                            f"{entry['total']:>10.2f}\n")
         return summary
 
 
 class ExcelDataProvider:
     """Handles reading test data from Excel file"""
 
-    def __init__(self, filepath: str, sheet_name: str):
+    def __init__(self, filepath: str, sheet_name: str, use_cache: bool = True, log: RunLogger = None):
         self.filepath = filepath
+        self.log = log or RunLogger()
         self.sheet_name = sheet_name
+        self.use_cache = use_cache
         self.workbook = None
         self.worksheet = None
 
-    def initialize_connection(self):
-        """Opens Excel file and selects worksheet"""
+    def initialize_connection(self, read_only: bool = False):
+        """
+        Opens Excel file and selects worksheet
+
+        Args:
+            read_only: Open the workbook in openpyxl's lazy read-only mode.
+                       Rows are then parsed on demand, but the sheet cannot be written back.
+        """
         try:
-            self.workbook = openpyxl.load_workbook(self.filepath)
+            self.workbook = openpyxl.load_workbook(self.filepath, read_only=read_only)
             self.worksheet = self.workbook[self.sheet_name]
-            print(f"✓ Successfully loaded Excel file: {self.filepath}")
-            print(f"✓ Active sheet: {self.sheet_name}")
+            self.log.info(f"✓ Successfully loaded Excel file: {self.filepath}")
+            self.log.info(f"✓ Active sheet: {self.sheet_name}")
             return True
         except Exception as error:
-            print(f"✗ Error loading Excel file: {error}")
+            self.log.error(f"✗ Error loading Excel file: {error}")
             return False
 
-    def extract_test_scenarios(self) -> List[Dict]:
-        """Extracts all test scenarios from Excel sheet"""
-        scenarios_collection = []
+    def iter_test_scenarios(self) -> Iterator[Dict]:
+        """Yields test scenarios one row at a time (blank rows are skipped)"""
+        rows = self.worksheet.iter_rows(values_only=True)
 
         # Read header row to get column mapping
-        header_row = [cell.value for cell in self.worksheet[1]]
+        header_row = next(rows, None)
+        if header_row is None:
+            return
 
         # Process each data row (starting from row 2)
-        for row_index in range(2, self.worksheet.max_row + 1):
-            scenario_dict = {}
-            for col_index, header in enumerate(header_row, start=1):
-                cell_value = self.worksheet.cell(row=row_index, column=col_index).value
-                scenario_dict[header] = cell_value if cell_value is not None else ""
+        for row_values in rows:
+            if all(value is None for value in row_values):
+                continue
+            yield {header: (value if value is not None else "")
+                   for header, value in zip(header_row, row_values)}
 
-            scenarios_collection.append(scenario_dict)
+    def extract_test_scenarios(self) -> List[Dict]:
+        """Extracts all test scenarios from Excel sheet (via the shared scenario cache)"""
+        try:
+            scenarios_collection = load_test_scenarios(self.filepath, self.sheet_name, use_cache=self.use_cache)
+        except Exception as error:
+            self.log.error(f"✗ Error loading Excel file: {error}")
+            return []
 
-        print(f" Extracted {len(scenarios_collection)} test scenarios from Excel")
+        self.log.info(f" Extracted {len(scenarios_collection)} test scenarios from Excel")
         return scenarios_collection
 
-    def write_test_results(self, results: List[Dict]):
+    def write_test_results(self, results: List[Dict], results_file: str = None):
         """
         Writes test results back to Excel file
 
         Args:
             results: List of dictionaries containing test results
+            results_file: If given, results go to this separate write-only workbook
+                          and the source sheet is left untouched
         """
-        # Add new columns for results if they don't exist
-        header_row = [cell.value for cell in self.worksheet[1]]
-
-        # Check if result columns already exist
-        if 'ActualOutcome' not in header_row:
-            next_col = len(header_row) + 1
-            self.worksheet.cell(row=1, column=next_col).value = 'ActualOutcome'
-            self.worksheet.cell(row=1, column=next_col + 1).value = 'ActualMessage'
-            self.worksheet.cell(row=1, column=next_col + 2).value = 'TestResult'
-            self.worksheet.cell(row=1, column=next_col + 3).value = 'ExecutionTime'
-
-            # Style the new headers
-            from openpyxl.styles import Font, PatternFill, Alignment
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF", size=11)
-
-            for col in range(next_col, next_col + 4):
-                cell = self.worksheet.cell(row=1, column=col)
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-
-        # Write results for each test case
-        for row_index in range(2, self.worksheet.max_row + 1):
-            test_id = self.worksheet.cell(row=row_index, column=1).value
-
-            # Find matching result
+        if results_file:
+            result_writer = ExcelResultWriter(results_file, log=self.log)
             for result in results:
-                if result['test_id'] == test_id:
-                    # Find the result columns
-                    actual_outcome_col = header_row.index(
-                        'ActualOutcome') + 1 if 'ActualOutcome' in header_row else len(header_row) + 1
-
-                    # Write actual outcome
-                    self.worksheet.cell(row=row_index, column=actual_outcome_col).value = result['actual_status']
-
-                    # Write actual message
-                    self.worksheet.cell(row=row_index, column=actual_outcome_col + 1).value = result['actual_message']
-
-                    # Write test result (PASSED/FAILED)
-                    result_cell = self.worksheet.cell(row=row_index, column=actual_outcome_col + 2)
-                    result_cell.value = result['test_result']
+                result_writer.append_result(result)
+            result_writer.save()
+            return
 
-                    # Color code the result
-                    from openpyxl.styles import PatternFill
-                    if result['test_result'] == 'PASSED':
-                        result_cell.fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-                    else:
-                        result_cell.fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+        # Index results by test id (first result wins, as before)
+        results_by_id = {}
+        for result in results:
+            results_by_id.setdefault(result['test_id'], result)
 
-                    # Write execution time
-                    self.worksheet.cell(row=row_index, column=actual_outcome_col + 3).value = result['execution_time']
+        # Add new columns for results if they don't exist
+        header_row = [cell.value for cell in self.worksheet[1]]
 
-                    break
+        # Check if result columns already exist
+        if 'ActualOutcome' in header_row:
+            actual_outcome_col = header_row.index('ActualOutcome') + 1
+        else:
+            actual_outcome_col = len(header_row) + 1
+            for offset, title in enumerate(RESULT_COLUMNS):
+                cell = self.worksheet.cell(row=1, column=actual_outcome_col + offset)
+                cell.value = title
+                cell.fill = RESULT_HEADER_FILL
+                cell.font = RESULT_HEADER_FONT
+                cell.alignment = RESULT_HEADER_ALIGNMENT
+
+        # Write results for each test case in a single pass over the id column
+        for (id_cell,) in self.worksheet.iter_rows(min_row=2, max_col=1):
+            result = results_by_id.get(id_cell.value)
+            if result is None:
+                continue
+            row_index = id_cell.row
+
+            # Write actual outcome and message
+            self.worksheet.cell(row=row_index, column=actual_outcome_col).value = result['actual_status']
+            self.worksheet.cell(row=row_index, column=actual_outcome_col + 1).value = result['actual_message']
+
+            # Write test result (PASSED/FAILED), color coded
+            result_cell = self.worksheet.cell(row=row_index, column=actual_outcome_col + 2)
+            result_cell.value = result['test_result']
+            result_cell.fill = PASSED_FILL if result['test_result'] == 'PASSED' else FAILED_FILL
+
+            # Write execution time
+            self.worksheet.cell(row=row_index, column=actual_outcome_col + 3).value = result['execution_time']
 
         # Save the workbook
         self.workbook.save(self.filepath)
-        print(f"\n Test results written back to Excel file: {self.filepath}")
+        self.log.info(f"\n Test results written back to Excel file: {self.filepath}")
+
+        # The sheet is already parsed in memory: re-key the scenario cache to the
+        # saved file, so the next run does not parse it again because of this write
+        if self.use_cache:
+            refresh_cache(self.filepath, self.sheet_name, self.worksheet.iter_rows(values_only=True))
 
     def close_connection(self):
         """Closes Excel workbook"""
@@ -153,6 +265,81 @@ class ExcelDataProvider:
             self.workbook.close()
 
 
+class ExcelResultWriter:
+    """Streams test results into a separate write-only results workbook"""
+
+    def __init__(self, filepath: str, sheet_name: str = "TestResults", log: RunLogger = None):
+        self.filepath = filepath
+        self.log = log or RunLogger()
+        self.workbook = openpyxl.Workbook(write_only=True)
+        self.worksheet = self.workbook.create_sheet(sheet_name)
+        self.rows_written = 0
+
+        header = []
+        for title in RESULT_WORKBOOK_COLUMNS:
+            cell = WriteOnlyCell(self.worksheet, value=title)
+            cell.fill = RESULT_HEADER_FILL
+            cell.font = RESULT_HEADER_FONT
+            cell.alignment = RESULT_HEADER_ALIGNMENT
+            header.append(cell)
+        self.worksheet.append(header)
+
+    def append_result(self, result: Dict):
+        """Appends one result row; rows are flushed to disk by openpyxl as they go"""
+        result_cell = WriteOnlyCell(self.worksheet, value=result['test_result'])
+        result_cell.fill = PASSED_FILL if result['test_result'] == 'PASSED' else FAILED_FILL
+        self.worksheet.append([
+            result['test_id'],
+            result['actual_status'],
+            result['actual_message'],
+            result_cell,
+            result['execution_time'],
+            result.get('category'),
+            result.get('duration')
+        ])
+        self.rows_written += 1
+
+    @staticmethod
+    def read_results(filepath: str, sheet_name: str = "TestResults") -> List[Dict]:
+        """
+        Reads a results workbook written by ExcelResultWriter back into result dictionaries
+
+        Columns are matched by header, so workbooks written before TestCategory and
+        DurationSeconds existed read with the default category and no duration.
+        """
+        workbook = openpyxl.load_workbook(filepath, read_only=True)
+        try:
+            rows = workbook[sheet_name].iter_rows(values_only=True)
+            header = next(rows, ())
+            positions = {title: position for position, title in enumerate(header)}
+
+            def column(row, title, default=None):
+                position = positions.get(title)
+                value = row[position] if position is not None and position < len(row) else None
+                return default if value is None else value
+
+            return [
+                {
+                    'test_id': column(row, 'TestCaseID'),
+                    'actual_status': column(row, 'ActualOutcome'),
+                    'actual_message': column(row, 'ActualMessage'),
+                    'test_result': column(row, 'TestResult'),
+                    'execution_time': column(row, 'ExecutionTime'),
+                    'category': column(row, 'TestCategory', "General"),
+                    'duration': column(row, 'DurationSeconds')
+                }
+                for row in rows
+                if column(row, 'TestCaseID') is not None
+            ]
+        finally:
+            workbook.close()
+
+    def save(self):
+        """Finalizes the results workbook (can only be called once)"""
+        self.workbook.save(self.filepath)
+        self.log.info(f"\n {self.rows_written} test results written to Excel file: {self.filepath}")
+
+
 class LoginFormValidator:
     """Simulates login validation logic (replaces actual Selenium interaction)"""
 
@@ -160,13 +347,44 @@ class LoginFormValidator:
         "student": "Password123"
     }
 
+    # Security checks, matched case-insensitively; earlier patterns take precedence
+    DANGEROUS_PATTERNS = ("<script>", "OR '1'='1", "';", "DROP TABLE", "<", ">")
+    MAX_FIELD_LENGTH = 100
+
+    # Simulated page load delay in seconds (0 disables it)
+    PAGE_LOAD_DELAY = 0.1
+
+    # Bump when validation logic changes in a way the constants above do not capture
+    RULES_VERSION = 1
+
+    # Rules compiled once: a single alternation answers "any pattern?" in one scan
+    _LOWERED_PATTERNS = tuple(pattern.lower() for pattern in DANGEROUS_PATTERNS)
+    _DANGEROUS_MATCHER = re.compile("|".join(re.escape(pattern) for pattern in _LOWERED_PATTERNS))
+
+    @staticmethod
+    def rules_fingerprint() -> str:
+        """Identifies the current validation rules, for keying cached results"""
+        return json.dumps([
+            LoginFormValidator.RULES_VERSION,
+            sorted(LoginFormValidator.VALID_CREDENTIALS.items()),
+            LoginFormValidator.DANGEROUS_PATTERNS,
+            LoginFormValidator.MAX_FIELD_LENGTH
+        ])
+
     @staticmethod
+    @functools.lru_cache(maxsize=65536)
     def validate_login_attempt(username: str, password: str) -> Tuple[str, str]:
         """
         Simulates login validation for practicetestautomation.com
         Valid credentials: username="student", password="Password123"
+        Results are memoized, so repeated inputs cost a dict lookup.
         Returns: (status, message) tuple
         """
+        return LoginFormValidator._apply_rules(username, password)
+
+    @staticmethod
+    def _apply_rules(username: str, password: str) -> Tuple[str, str]:
+        """Runs the validation rules without memoization"""
 
         # Check for empty fields - username is checked first
         if not username:
@@ -174,18 +392,23 @@ class LoginFormValidator:
         if not password:
             return ("FAILURE", "Your password is invalid!")
 
-        # Check for invalid characters (security checks)
-        dangerous_patterns = ["<script>", "OR '1'='1", "';", "DROP TABLE", "<", ">"]
-        for pattern in dangerous_patterns:
-            if pattern.lower() in username.lower():
-                return ("FAILURE", "Your username is invalid!")
-            if pattern.lower() in password.lower():
-                return ("FAILURE", "Your password is invalid!")
+        # Check for invalid characters (security checks).
+        # Both fields are scanned at once; no pattern contains the NUL separator,
+        # so a match can never span the two. Only on a hit do we need the
+        # per-pattern order (username before password) to pick the message.
+        username_lower = username.lower()
+        password_lower = password.lower()
+        if LoginFormValidator._DANGEROUS_MATCHER.search(f"{username_lower}\0{password_lower}"):
+            for pattern in LoginFormValidator._LOWERED_PATTERNS:
+                if pattern in username_lower:
+                    return ("FAILURE", "Your username is invalid!")
+                if pattern in password_lower:
+                    return ("FAILURE", "Your password is invalid!")
 
         # Check username length (boundary test)
-        if len(username) > 100:
+        if len(username) > LoginFormValidator.MAX_FIELD_LENGTH:
             return ("FAILURE", "Your username is invalid!")
-        if len(password) > 100:
+        if len(password) > LoginFormValidator.MAX_FIELD_LENGTH:
             return ("FAILURE", "Your password is invalid!")
 
         # Check for trailing/leading spaces
@@ -202,15 +425,54 @@ class LoginFormValidator:
             return ("FAILURE", "Your username is invalid!")
 
     @staticmethod
-    def perform_login_test(username: str, password: str) -> Dict:
+    def validate_many(usernames: Iterable[str], passwords: Iterable[str],
+                      memoize: bool = True) -> Tuple[List[str], List[str]]:
+        """
+        Validates columns of credentials in one call
+
+        Args:
+            usernames: Username column
+            passwords: Password column (same length as usernames)
+            memoize: Evaluate each distinct (username, password) pair only once.
+                     Turn off for mostly-unique inputs, where the memo costs more than it saves.
+
+        Returns: (statuses, messages) lists, aligned with the input columns
+        Raises: ValueError if the columns differ in length
+        """
+        apply_rules = LoginFormValidator._apply_rules
+        # strict: a missing password must not silently drop the rest of the batch
+        pairs = zip(usernames, passwords, strict=True)
+        if memoize:
+            # A batch-local memo is cheaper than the bounded LRU and never evicts
+            memo = {}
+            outcomes = []
+            for credentials in pairs:
+                outcome = memo.get(credentials)
+                if outcome is None:
+                    outcome = memo[credentials] = apply_rules(*credentials)
+                outcomes.append(outcome)
+        else:
+            outcomes = [apply_rules(*credentials) for credentials in pairs]
+
+        if not outcomes:
+            return [], []
+        statuses, messages = zip(*outcomes)
+        return list(statuses), list(messages)
+
+    @staticmethod
+    def perform_login_test(username: str, password: str, simulate_delay: bool = True) -> Dict:
         """
         Executes login test with given credentials
+
+        Args:
+            simulate_delay: Block for PAGE_LOAD_DELAY; async engines wait on
+                            their own latency model instead
+
         Returns detailed result dictionary
         """
-        print(f"\n Testing credentials: [{username}] / [{'*' * len(password)}]")
-
         # Simulate page load delay
-        time.sleep(0.1)
+        if simulate_delay and LoginFormValidator.PAGE_LOAD_DELAY > 0:
+            time.sleep(LoginFormValidator.PAGE_LOAD_DELAY)
 
         # Execute validation
         status, message = LoginFormValidator.validate_login_attempt(username, password)
@@ -224,58 +486,473 @@ class LoginFormValidator:
         return result
 
 
+class LatencyModel:
+    """Base class for simulated page latency used by AsyncDataDrivenTestEngine"""
+
+    def next_delay(self) -> float:
+        """Returns the next simulated delay in seconds"""
+        raise NotImplementedError
+
+    async def wait(self):
+        """Awaits the next simulated delay without blocking the event loop"""
+        delay = self.next_delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class FixedLatency(LatencyModel):
+    """Same delay for every scenario"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def next_delay(self) -> float:
+        return self.seconds
+
+
+class DistributionLatency(LatencyModel):
+    """Log-normally distributed delay with the given mean and standard deviation"""
+
+    def __init__(self, mean: float, stddev: float, seed: int = None):
+        if mean <= 0:
+            raise ValueError(f"mean must be positive, got {mean}")
+        self.mean = mean
+        self.stddev = stddev
+        self._random = random.Random(seed)
+        # Convert the target mean/stddev into the underlying normal parameters
+        sigma_squared = math.log(1 + (stddev / mean) ** 2)
+        self._mu = math.log(mean) - sigma_squared / 2
+        self._sigma = math.sqrt(sigma_squared)
+
+    def next_delay(self) -> float:
+        return self._random.lognormvariate(self._mu, self._sigma)
+
+
+class RecordedLatency(LatencyModel):
+    """Replays recorded delays in order, wrapping around at the end"""
+
+    def __init__(self, samples: List[float]):
+        if not samples:
+            raise ValueError("RecordedLatency needs at least one sample")
+        self.samples = list(samples)
+        self._position = 0
+
+    @classmethod
+    def from_file(cls, filepath: str) -> "RecordedLatency":
+        """Loads one delay in seconds per line (blank lines and # comments are ignored)"""
+        with open(filepath) as handle:
+            samples = [float(line) for line in (raw.split("#", 1)[0].strip() for raw in handle) if line]
+        return cls(samples)
+
+    def next_delay(self) -> float:
+        delay = self.samples[self._position]
+        self._position = (self._position + 1) % len(self.samples)
+        return delay
+
+
+def parse_latency_model(spec: str) -> LatencyModel:
+    """
+    Builds a latency model from a command-line spec
+
+    Accepted forms:
+        fixed:SECONDS
+        lognormal:MEAN,STDDEV
+        recorded:PATH
+
+    Used as an argparse type, so a bad spec is reported as a usage error.
+    Raises: argparse.ArgumentTypeError for a malformed spec or unreadable file
+    """
+    kind, _, argument = spec.partition(":")
+    try:
+        if kind == "fixed":
+            return FixedLatency(float(argument))
+        if kind == "lognormal":
+            mean, stddev = (float(value) for value in argument.split(","))
+            return DistributionLatency(mean, stddev)
+        if kind == "recorded":
+            return RecordedLatency.from_file(argument)
+    except (ValueError, OSError) as error:
+        raise argparse.ArgumentTypeError(f"invalid latency model {spec!r}: {error}") from error
+    raise argparse.ArgumentTypeError(
+        f"unknown latency model {spec!r} (expected fixed:SECONDS, lognormal:MEAN,STDDEV or recorded:PATH)")
+
+
 class DataDrivenTestEngine:
     """Main test execution engine"""
 
-    def __init__(self, excel_file: str, sheet_name: str):
-        self.data_provider = ExcelDataProvider(excel_file, sheet_name)
-        self.tracker = TestExecutionTracker()
+    EXECUTOR_TYPES = ("thread", "process")
+
+    # Scenarios per process-pool task when the sheet length is not known up front
+    STREAM_BATCH_SIZE = 32
+
+    def __init__(self, excel_file: str, sheet_name: str, workers: int = 1, executor_type: str = "thread",
+                 streaming: bool = False, results_file: str = None,
+                 resume: bool = False, skip_unchanged: bool = False,
+                 shard_index: int = 0, shard_count: int = 1,
+                 profiler: str = None, metrics_dir: str = "metrics",
+                 log_level: str = "summary", log_file: str = None):
+        """
+        Args:
+            excel_file: Path to the scenario workbook
+            sheet_name: Worksheet holding the scenarios
+            workers: Number of concurrent workers (1 = run sequentially)
+            executor_type: "thread" or "process" worker pool
+            streaming: Read scenarios lazily and stream results to a separate
+                       results workbook, keeping memory flat for any sheet size
+            results_file: Separate results workbook; the source sheet is then opened
+                          read-only and never rewritten. Streaming mode always uses
+                          one (default: <excel_file>_results.xlsx)
+            resume: Replay the checkpoint journal of an interrupted run instead of
+                    re-running the scenarios it already finished
+            skip_unchanged: Reuse results of scenarios that passed in an earlier run
+                            with the same inputs and validator rules
+            shard_index: 0-based shard to run when the sheet is split across agents
+            shard_count: Number of shards; with more than one, results always go to a
+                         per-shard workbook (default: <excel_file>_results_shardIofN.xlsx)
+            profiler: Profile every phase with "cprofile" or "sampling" (default: off)
+            metrics_dir: Directory for the per-run JSON metrics file and profiles
+            log_level: Console output, one of "quiet", "summary" or "verbose"
+                       (per-scenario output is only shown when verbose)
+            log_file: Also write every log record to this JSON-lines file
+        """
+        if executor_type not in self.EXECUTOR_TYPES:
+            raise ValueError(f"executor_type must be one of {self.EXECUTOR_TYPES}, got {executor_type!r}")
+        self.log = RunLogger(log_level, json_file=log_file)
+        self.data_provider = ExcelDataProvider(excel_file, sheet_name, log=self.log)
+        self.tracker = TestExecutionTracker(keep_outcomes=not streaming)
+        self.workers = max(1, workers)
+        self.executor_type = executor_type
+        self.streaming = streaming
+        validate_shard(shard_index, shard_count)
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        # Per-shard outputs and run state must not collide when shards share a machine
+        state_prefix = f"{shard_suffix(shard_index, shard_count)}." if shard_count > 1 else ""
+        self.results_file = results_file
+        if results_file is None:
+            if shard_count > 1:
+                self.results_file = f"{os.path.splitext(excel_file)[0]}_results_{shard_suffix(shard_index, shard_count)}.xlsx"
+            elif streaming:
+                self.results_file = f"{os.path.splitext(excel_file)[0]}_results.xlsx"
+        self.resume = resume
+        self.skip_unchanged = skip_unchanged
+        self.journal_file = run_state_path(excel_file, sheet_name, f"{state_prefix}journal.jsonl")
+        self.result_cache_file = run_state_path(excel_file, sheet_name, f"{state_prefix}results-cache.json")
+        self.journal = None
+        self.result_cache = None
+        run_name = f"ddt_{shard_suffix(shard_index, shard_count)}" if shard_count > 1 else "ddt"
+        self.phase_timer = PhaseTimer(run_name, profiler=profiler, output_dir=metrics_dir)
 
     def execute_test_suite(self):
         """Runs complete test suite"""
 
-        print("\n" + "=" * 70)
-        print(" DATA-DRIVEN TEST AUTOMATION - LOGIN FUNCTIONALITY")
-        print("=" * 70)
-        print(f" Target: https://practicetestautomation.com/practice-test-login/")
-        print(f" Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("=" * 70 + "\n")
-
-        # Initialize Excel connection
-        if not self.data_provider.initialize_connection():
-            print("Failed to initialize data provider. Exiting...")
+        self.log.info("\n" + "=" * 70)
+        self.log.info(" DATA-DRIVEN TEST AUTOMATION - LOGIN FUNCTIONALITY")
+        self.log.info("=" * 70)
+        self.log.info(f" Target: https://practicetestautomation.com/practice-test-login/")
+        self.log.info(f" Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        if self.shard_count > 1:
+            self.log.info(f" Shard: {self.shard_index + 1} of {self.shard_count}")
+        self.log.info("=" * 70 + "\n")
+
+        if self.streaming:
+            # Rows are read lazily from the open sheet instead of the scenario cache
+            with self.phase_timer.phase("data_loading"):
+                connected = self.data_provider.initialize_connection(read_only=True)
+            if not connected:
+                self.log.error("Failed to initialize data provider. Exiting...")
+                return
+            self._open_run_state()
+            self._execute_streaming_suite()
             return
 
         # Extract test scenarios
-        test_scenarios = self.data_provider.extract_test_scenarios()
+        with self.phase_timer.phase("data_loading"):
+            test_scenarios = self.data_provider.extract_test_scenarios()
+            if self.shard_count > 1:
+                test_scenarios = list(select_shard(test_scenarios, self.shard_index, self.shard_count))
+                self.log.info(f" {len(test_scenarios)} scenarios belong to shard {self.shard_index + 1} of {self.shard_count}")
 
         if not test_scenarios:
-            print("No test scenarios found in Excel file.")
+            self.log.info("No test scenarios found in Excel file.")
             return
 
+        self._open_run_state()
+
         # Execute each test scenario and collect results
-        print(f"\n{'─' * 70}")
-        print("EXECUTING TEST SCENARIOS")
-        print(f"{'─' * 70}")
+        self.log.info(f"\n{'─' * 70}")
+        self.log.info("EXECUTING TEST SCENARIOS")
+        self.log.info(f"{'─' * 70}")
 
-        results_for_excel = []
-        for index, scenario in enumerate(test_scenarios, start=1):
-            result_data = self._run_single_test(index, scenario)
-            results_for_excel.append(result_data)
+        with self.phase_timer.phase("scenario_execution"):
+            results_for_excel = self._execute_scenarios(test_scenarios)
 
         # Generate results
-        self._display_detailed_results()
-
-        # Write results back to Excel
-        self.data_provider.write_test_results(results_for_excel)
+        with self.phase_timer.phase("summary"):
+            self._display_detailed_results()
+
+        # Write results back to Excel. Only the write-back into the source sheet needs
+        # the workbook opened with openpyxl; loading the scenarios used the cache.
+        with self.phase_timer.phase("excel_save"):
+            if self.results_file is None and not self.data_provider.initialize_connection():
+                self.log.error("Failed to open the workbook for the results; run again with --resume")
+                self.journal.close()
+                self.log.flush()
+                return
+            self.data_provider.write_test_results(results_for_excel, results_file=self.results_file)
 
         # Cleanup
+        self._finish_run_state()
+        self.data_provider.close_connection()
+        self._export_metrics()
+        self.log.info("\n✓ Test execution completed\n")
+        self.log.flush()
+
+    def _export_metrics(self):
+        """Prints the phase breakdown and writes this run's JSON metrics file"""
+        self.log.info("\nTIME BY PHASE:")
+        self.log.info("\n".join(self.phase_timer.summary_lines()))
+        self.log.event("run_summary", {
+            'total_test_cases': self.tracker.total_assertions,
+            'passed': self.tracker.passed_assertions,
+            'failed': self.tracker.total_assertions - self.tracker.passed_assertions,
+            'phases': dict(self.phase_timer.phases)
+        }, level="summary")
+        metrics_file = self.phase_timer.export({
+            'engine': type(self).__name__,
+            'settings': {
+                'workers': self.workers,
+                'executor_type': self.executor_type,
+                'streaming': self.streaming,
+                'shard_index': self.shard_index,
+                'shard_count': self.shard_count
+            },
+            'total_test_cases': self.tracker.total_assertions,
+            'passed': self.tracker.passed_assertions,
+            'failed': self.tracker.total_assertions - self.tracker.passed_assertions,
+            'latency_seconds': self.tracker.latency_statistics()
+        })
+        self.log.info(f"\n Run metrics written to {metrics_file}")
+
+    def _open_run_state(self):
+        """Opens the checkpoint journal and, if enabled, the result cache"""
+        self.journal = CheckpointJournal(self.journal_file, resume=self.resume)
+        if self.journal.entries:
+            self.log.info(f" Resuming: {len(self.journal.entries)} scenarios already finished in the journal")
+        if self.skip_unchanged:
+            self.result_cache = ResultCache(self.result_cache_file)
+            self.log.info(f" Result cache: {len(self.result_cache.entries)} passing scenarios on record")
+
+    def _finish_run_state(self):
+        """Results are safely in Excel: drop the journal and persist the result cache"""
+        self.journal.complete()
+        if self.result_cache is not None:
+            self.result_cache.save()
+
+    def _execute_streaming_suite(self):
+        """Runs scenarios straight from the read-only sheet into the results workbook"""
+        self.log.info(f"\n{'─' * 70}")
+        self.log.info("EXECUTING TEST SCENARIOS (STREAMING)")
+        self.log.info(f"{'─' * 70}")
+
+        result_writer = ExcelResultWriter(self.results_file, log=self.log)
+        scenarios = self.data_provider.iter_test_scenarios()
+        if self.shard_count > 1:
+            scenarios = select_shard(scenarios, self.shard_index, self.shard_count)
+
+        # Loading, execution and result writing are interleaved row by row here
+        with self.phase_timer.phase("scenario_execution"):
+            for result_data, result_details in self._iter_results(scenarios, self.STREAM_BATCH_SIZE):
+                self._record_result(result_data, result_details)
+                result_writer.append_result(result_data)
+
+        with self.phase_timer.phase("summary"):
+            self._display_detailed_results()
+
+        with self.phase_timer.phase("excel_save"):
+            result_writer.save()
+        self._finish_run_state()
         self.data_provider.close_connection()
-        print("\n✓ Test execution completed\n")
+        self._export_metrics()
+        self.log.info("\n✓ Test execution completed\n")
+        self.log.flush()
 
-    def _run_single_test(self, index: int, scenario: Dict) -> Dict:
+    def merge_shard_results(self, result_files: List[str]):
         """
-        Executes individual test case
+        Combines per-shard results workbooks into one summary and one Excel write-back
+
+        Args:
+            result_files: Results workbooks written by the individual shards
+        """
+        self.log.info("\n" + "=" * 70)
+        self.log.info(" MERGING SHARD RESULTS")
+        self.log.info("=" * 70)
+
+        merged_results = []
+        for result_file in result_files:
+            shard_results = ExcelResultWriter.read_results(result_file)
+            self.log.info(f" {result_file}: {len(shard_results)} results")
+            merged_results.extend(shard_results)
+
+        for result in merged_results:
+            self.tracker.record_outcome(result['test_id'], result['test_result'],
+                                        f"{result['actual_status']} - {result['actual_message']}",
+                                        category=result['category'], duration=result['duration'])
+
+        # The shards' own durations are in the latency table; the merge's wall time means nothing
+        self._display_detailed_results(include_duration=False)
+
+        # Write merged results back into the source sheet, or into one results workbook
+        if self.results_file is None:
+            if not self.data_provider.initialize_connection():
+                self.log.error("Failed to initialize data provider. Exiting...")
+                return
+        self.data_provider.write_test_results(merged_results, results_file=self.results_file)
+        self.data_provider.close_connection()
+        self.log.info("\n✓ Shard merge completed\n")
+        self.log.flush()
+
+    def _execute_scenarios(self, test_scenarios: List[Dict]) -> List[Dict]:
+        """
+        Runs all scenarios, either sequentially or on a worker pool
+
+        Workers only evaluate scenarios; outcomes are recorded in the tracker
+        by the calling thread, so results always come back in sheet order.
+        """
+        batch_size = max(1, len(test_scenarios) // (self.workers * 4))
+
+        results_for_excel = []
+        for result_data, result_details in self._iter_results(test_scenarios, batch_size):
+            self._record_result(result_data, result_details)
+            results_for_excel.append(result_data)
+
+        return results_for_excel
+
+    def _iter_results(self, scenarios: Iterable[Dict], batch_size: int) -> Iterator[Tuple[Dict, str]]:
+        """
+        Yields (result data, details) in sheet order, replaying journaled or cached
+        results and evaluating only the remaining scenarios
+
+        Every freshly evaluated scenario is appended to the checkpoint journal.
+        Reused rows go through the evaluator as placeholders, so they are yielded as
+        soon as every row before them has been, however long a run of them is.
+        """
+        version = LoginFormValidator.rules_fingerprint()
+        # (key, reused (result, details) or None) for every scenario handed to the evaluator
+        pending = deque()
+
+        def scenarios_to_run():
+            for scenario in scenarios:
+                key = scenario_fingerprint(scenario, version)
+                reused = self.journal.lookup(key)
+                if reused is None and self.result_cache is not None:
+                    reused = self.result_cache.lookup(key)
+                    if reused is not None:
+                        self.journal.record(key, *reused)
+                pending.append((key, reused))
+                yield scenario if reused is None else None
+
+        def settle(key, result_data, result_details):
+            if self.result_cache is not None:
+                self.result_cache.store(key, result_data, result_details, result_data['test_result'] == "PASSED")
+
+        for evaluated in self._iter_evaluated(scenarios_to_run(), batch_size):
+            key, reused = pending.popleft()
+            if evaluated is None:
+                result_data, result_details = reused
+                settle(key, result_data, result_details)
+                # Reused results did not run now, so they do not count towards latency stats
+                yield dict(result_data, duration=None), f"{result_details} | reused"
+                continue
+            result_data, result_details = evaluated
+            self.journal.record(key, result_data, result_details)
+            settle(key, result_data, result_details)
+            yield result_data, result_details
+
+    def _iter_evaluated(self, scenarios: Iterable[Dict], batch_size: int) -> Iterator[Tuple[Dict, str]]:
+        """
+        Evaluates scenarios and yields (result data, details) in sheet order
+
+        Only a bounded window of batches is in flight at a time, so the input
+        iterable is consumed lazily. Thread pools always use single-scenario
+        batches; batching only pays off for process pools. A None in the input
+        is a row that needs no evaluation; None is yielded in its place.
+        """
+        if self.workers == 1:
+            for index, scenario in enumerate(scenarios, start=1):
+                yield None if scenario is None else DataDrivenTestEngine._evaluate_scenario(index, scenario)
+            return
+
+        self.log.info(f" Running with {self.workers} {self.executor_type} workers")
+        if self.executor_type == "process":
+            pool_class = ProcessPoolExecutor
+        else:
+            pool_class = ThreadPoolExecutor
+            batch_size = 1
+        max_in_flight = self.workers * 4
+
+        with pool_class(max_workers=self.workers) as pool:
+            # Futures of evaluated batches, or lists of placeholders that need no worker
+            in_flight = deque()
+            for start_index, batch in DataDrivenTestEngine._batched(scenarios, batch_size):
+                if all(scenario is None for scenario in batch):
+                    in_flight.append([None] * len(batch))
+                else:
+                    in_flight.append(pool.submit(DataDrivenTestEngine._evaluate_batch, start_index, batch))
+                while in_flight and isinstance(in_flight[0], list):
+                    yield from in_flight.popleft()
+                if len(in_flight) >= max_in_flight:
+                    yield from in_flight.popleft().result()
+            while in_flight:
+                batch_results = in_flight.popleft()
+                yield from (batch_results if isinstance(batch_results, list) else batch_results.result())
+
+    @staticmethod
+    def _batched(scenarios: Iterable[Dict], batch_size: int) -> Iterator[Tuple[int, List[Dict]]]:
+        """Groups scenarios into (1-based start index, batch) pairs"""
+        batch = []
+        start_index = 1
+        for index, scenario in enumerate(scenarios, start=1):
+            batch.append(scenario)
+            if len(batch) == batch_size:
+                yield start_index, batch
+                batch = []
+                start_index = index + 1
+        if batch:
+            yield start_index, batch
+
+    @staticmethod
+    def _evaluate_batch(start_index: int, batch: List[Dict]) -> List[Tuple[Dict, str]]:
+        """Evaluates a batch of scenarios on a single worker (None placeholders stay None)"""
+        return [None if scenario is None else DataDrivenTestEngine._evaluate_scenario(index, scenario)
+                for index, scenario in enumerate(batch, start=start_index)]
+
+    def _record_result(self, result_data: Dict, result_details: str):
+        """Records an evaluated scenario, with its category and duration, in the tracker"""
+        self.tracker.record_outcome(result_data['test_id'], result_data['test_result'], result_details,
+                                    category=result_data['category'], duration=result_data['duration'])
+        # Formatting and console output happen on the log writer thread, if at all
+        self.log.event("scenario", dict(result_data, index=self.tracker.total_assertions, details=result_details),
+                       render=DataDrivenTestEngine._render_scenario)
+
+    @staticmethod
+    def _render_scenario(fields: Dict) -> str:
+        """Console block for one scenario at verbose level"""
+        status_symbol = "✓" if fields['test_result'] == "PASSED" else "✗"
+        duration = f" ({fields['duration'] * 1000:.1f} ms)" if fields.get('duration') is not None else ""
+        return (f"\n[{fields['index']}] {fields['test_id']} - {fields.get('description', 'N/A')}\n"
+                f"  Category: {fields['category']}\n"
+                f"  Expected: {fields.get('expected_status', '')} - '{fields.get('expected_msg', '')}'\n"
+                f"  Actual: {fields['actual_status']} - '{fields['actual_message']}'\n"
+                f"  {status_symbol} Result: {fields['test_result']}{duration} | {fields['details']}")
+
+    @staticmethod
+    def _evaluate_scenario(index: int, scenario: Dict, simulate_delay: bool = True) -> Tuple[Dict, str]:
+        """
+        Executes individual test case without touching shared state,
+        so it can run on thread or process workers
+
+        Returns: (result data for Excel, result details) tuple
         """
 
         test_id = scenario.get('TestCaseID', f'TC{index:03d}')
@@ -286,11 +963,10 @@ class DataDrivenTestEngine:
         expected_msg = scenario.get('ExpectedMessage', '')
         category = scenario.get('TestCategory', 'General')
 
-        print(f"\n[{index}] {test_id} - {description}")
-        print(f"  Category: {category}")
+        started = time.perf_counter()
 
         # Execute the login test
-        test_result = LoginFormValidator.perform_login_test(username, password)
+        test_result = LoginFormValidator.perform_login_test(username, password, simulate_delay=simulate_delay)
 
         # Perform assertions
         status_match = test_result['actual_status'] == expected_status
@@ -298,15 +974,9 @@ class DataDrivenTestEngine:
 
         overall_result = "PASSED" if (status_match and message_match) else "FAILED"
 
-        # Log detailed results
-        print(f"  Expected: {expected_status} - '{expected_msg}'")
-        print(f"  Actual: {test_result['actual_status']} - '{test_result['actual_message']}'")
-
         if overall_result == "PASSED":
-            print(f"  ✓ Result: {overall_result}")
             result_details = f"All assertions passed | {test_result['execution_time']}"
         else:
-            print(f"  ✗ Result: {overall_result}")
             failure_reasons = []
             if not status_match:
                 failure_reasons.append(
@@ -316,33 +986,120 @@ class DataDrivenTestEngine:
                     f"Message mismatch (Expected: '{expected_msg}', Got: '{test_result['actual_message']}')")
             result_details = " | ".join(failure_reasons)
 
-        # Record in tracker
-        self.tracker.record_outcome(test_id, overall_result, result_details)
-
         # Return result data for Excel logging
-        return {
+        result_data = {
             'test_id': test_id,
+            # 1-based position in the run's scenario list: the sheet's data row unless sharded
+            'row': index,
+            'description': description,
+            'expected_status': expected_status,
+            'expected_msg': expected_msg,
             'actual_status': test_result['actual_status'],
             'actual_message': test_result['actual_message'],
             'test_result': overall_result,
-            'execution_time': test_result['execution_time']
+            'execution_time': test_result['execution_time'],
+            'category': category,
+            'duration': time.perf_counter() - started
         }
+        return result_data, result_details
 
-    def _display_detailed_results(self):
+    def _display_detailed_results(self, include_duration: bool = True):
         """Displays comprehensive test results"""
 
-        print("\n" + "=" * 70)
-        print(self.tracker.generate_summary_report())
+        self.log.info("\n" + "=" * 70)
+        self.log.info(self.tracker.generate_summary_report(include_duration=include_duration))
+
+        if not self.tracker.keep_outcomes:
+            self.log.info("=" * 70)
+            return
 
-        print("\nDETAILED RESULTS BY TEST CASE:")
-        print("─" * 70)
+        # The per-test table repeats every scenario, so it is only shown when verbose
+        if self.log.enabled("verbose"):
+            self.log.detail("\nDETAILED RESULTS BY TEST CASE:")
+            self.log.detail("─" * 70)
 
-        for outcome in self.tracker.test_outcomes:
-            status_symbol = "✓" if outcome['status'] == "PASSED" else "✗"
-            status_display = f"{status_symbol} {outcome['status']}"
-            print(f"{outcome['id']:<10} {status_display:<15} {outcome['details']}")
+            for outcome in self.tracker.test_outcomes:
+                status_symbol = "✓" if outcome['status'] == "PASSED" else "✗"
+                status_display = f"{status_symbol} {outcome['status']}"
+                self.log.detail(f"{outcome['id']:<10} {status_display:<15} {outcome['details']}")
 
-        print("=" * 70)
+        self.log.info("=" * 70)
+
+
+class AsyncDataDrivenTestEngine(DataDrivenTestEngine):
+    """
+    Runs scenarios as asyncio tasks, waiting on a pluggable latency model
+    instead of blocking on the page load delay
+    """
+
+    def __init__(self, excel_file: str, sheet_name: str, max_in_flight: int = 1000,
+                 latency_model: LatencyModel = None, streaming: bool = False, results_file: str = None,
+                 resume: bool = False, skip_unchanged: bool = False,
+                 shard_index: int = 0, shard_count: int = 1,
+                 profiler: str = None, metrics_dir: str = "metrics",
+                 log_level: str = "summary", log_file: str = None):
+        """
+        Args:
+            excel_file: Path to the scenario workbook
+            sheet_name: Worksheet holding the scenarios
+            max_in_flight: Semaphore limit on concurrently running scenarios
+            latency_model: Simulated page latency (default: FixedLatency(PAGE_LOAD_DELAY))
+            streaming, results_file, resume, skip_unchanged, shard_index, shard_count,
+            profiler, metrics_dir, log_level, log_file: See DataDrivenTestEngine
+        """
+        super().__init__(excel_file, sheet_name, streaming=streaming, results_file=results_file,
+                         resume=resume, skip_unchanged=skip_unchanged,
+                         shard_index=shard_index, shard_count=shard_count,
+                         profiler=profiler, metrics_dir=metrics_dir,
+                         log_level=log_level, log_file=log_file)
+        self.max_in_flight = max(1, max_in_flight)
+        self.latency_model = latency_model or FixedLatency(LoginFormValidator.PAGE_LOAD_DELAY)
+
+    def _iter_evaluated(self, scenarios: Iterable[Dict], batch_size: int) -> Iterator[Tuple[Dict, str]]:
+        """
+        Evaluates scenarios as tasks and yields (result data, details) in sheet order
+
+        The semaphore caps running scenarios; tasks are created at most a few
+        windows ahead of the consumer, so the input is still read lazily.
+        None placeholders in the input are yielded back as in the base engine.
+        """
+        self.log.info(f" Running on asyncio with up to {self.max_in_flight} scenarios in flight")
+        loop = asyncio.new_event_loop()
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        # Tasks, or None for rows that need no evaluation
+        pending = deque()
+        try:
+            for index, scenario in enumerate(scenarios, start=1):
+                if scenario is None:
+                    pending.append(None)
+                else:
+                    pending.append(loop.create_task(self._evaluate_async(semaphore, index, scenario)))
+                while pending and pending[0] is None:
+                    yield pending.popleft()
+                if len(pending) >= self.max_in_flight * 2:
+                    task = pending.popleft()
+                    yield None if task is None else loop.run_until_complete(task)
+            while pending:
+                task = pending.popleft()
+                yield None if task is None else loop.run_until_complete(task)
+        finally:
+            tasks = [task for task in pending if task is not None]
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.close()
+
+    async def _evaluate_async(self, semaphore: asyncio.Semaphore, index: int, scenario: Dict) -> Tuple[Dict, str]:
+        """Waits on the latency model, then evaluates the scenario"""
+        async with semaphore:
+            started = time.perf_counter()
+            await self.latency_model.wait()
+            result_data, result_details = DataDrivenTestEngine._evaluate_scenario(index, scenario,
+                                                                                  simulate_delay=False)
+            # Count the simulated latency towards the scenario duration
+            result_data['duration'] = time.perf_counter() - started
+            return result_data, result_details
 
 
 def main():
@@ -351,8 +1108,65 @@ def main():
     EXCEL_FILENAME = "test_data.xlsx"
     SHEET_NAME = "LoginTestScenarios"
 
+    parser = argparse.ArgumentParser(description="Data-driven login test suite")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of concurrent workers (default: 1, sequential)")
+    parser.add_argument("--executor", choices=DataDrivenTestEngine.EXECUTOR_TYPES, default="thread",
+                        help="Worker pool type used when --workers > 1")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Read the sheet lazily and stream results to a separate workbook")
+    parser.add_argument("--results-file", default=None,
+                        help="Write results to this separate workbook instead of back into the source sheet "
+                             "(default with --streaming: test_data_results.xlsx)")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Run scenarios on the asyncio engine instead of a worker pool")
+    parser.add_argument("--max-in-flight", type=int, default=1000,
+                        help="Concurrent scenarios for --async (default: 1000)")
+    parser.add_argument("--latency", type=parse_latency_model, default=None,
+                        help="Latency model for --async: fixed:SECONDS, lognormal:MEAN,STDDEV or recorded:PATH")
+    parser.add_argument("--resume", action="store_true",
+                        help="Resume an interrupted run from its checkpoint journal")
+    parser.add_argument("--skip-unchanged", action="store_true",
+                        help="Reuse results of scenarios that passed before with the same inputs and rules")
+    parser.add_argument("--shard-index", type=int, default=0,
+                        help="0-based shard of the sheet to run (default: 0)")
+    parser.add_argument("--shard-count", type=int, default=1,
+                        help="Number of shards the sheet is split into (default: 1)")
+    parser.add_argument("--merge", nargs="+", metavar="RESULTS_FILE",
+                        help="Merge per-shard results workbooks into one summary and Excel write-back")
+    parser.add_argument("--profile", choices=PROFILERS, default=None,
+                        help="Profile each run phase with cProfile or the sampling profiler")
+    parser.add_argument("--metrics-dir", default="metrics",
+                        help="Directory for the per-run JSON metrics file (default: metrics)")
+    parser.add_argument("--log-level", choices=LOG_LEVELS, default="summary",
+                        help="Console output: quiet, summary (default) or verbose with one block per scenario")
+    parser.add_argument("--log-file", default=None,
+                        help="Also write structured log records to this JSON-lines file")
+    args = parser.parse_args()
+    exit_on_sigterm()
+
+    if args.merge:
+        DataDrivenTestEngine(EXCEL_FILENAME, SHEET_NAME, results_file=args.results_file,
+                             log_level=args.log_level, log_file=args.log_file).merge_shard_results(args.merge)
+        return
+
     # Create and run test engine
-    test_engine = DataDrivenTestEngine(EXCEL_FILENAME, SHEET_NAME)
+    if args.use_async:
+        test_engine = AsyncDataDrivenTestEngine(EXCEL_FILENAME, SHEET_NAME,
+                                                max_in_flight=args.max_in_flight, latency_model=args.latency,
+                                                streaming=args.streaming, results_file=args.results_file,
+                                                resume=args.resume, skip_unchanged=args.skip_unchanged,
+                                                shard_index=args.shard_index, shard_count=args.shard_count,
+                                                profiler=args.profile, metrics_dir=args.metrics_dir,
+                                                log_level=args.log_level, log_file=args.log_file)
+    else:
+        test_engine = DataDrivenTestEngine(EXCEL_FILENAME, SHEET_NAME,
+                                           workers=args.workers, executor_type=args.executor,
+                                           streaming=args.streaming, results_file=args.results_file,
+                                           resume=args.resume, skip_unchanged=args.skip_unchanged,
+                                           shard_index=args.shard_index, shard_count=args.shard_count,
+                                           profiler=args.profile, metrics_dir=args.metrics_dir,
+                                           log_level=args.log_level, log_file=args.log_file)
     test_engine.execute_test_suite()
 
 
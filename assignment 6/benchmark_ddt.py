@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for the Data-Driven Test Pipeline
+Generates synthetic scenario workbooks and times each pipeline phase
+separately (load, execute, write-back) with the page delay stubbed out.
+
+Usage:
+    python benchmark_ddt.py                                  # 1k, 10k and 100k rows
+    python benchmark_ddt.py --sizes 1000000 --no-memory      # 1M rows, time only
+    python benchmark_ddt.py --sizes 1000 10000 --output bench.json
+    python benchmark_ddt.py --baseline bench.json            # fail on regressions
+
+Results are written as JSON. With --baseline, the script exits with status 1
+if any phase got slower than the baseline by more than --tolerance.
+Sheets larger than --memory-max-rows are timed without tracemalloc, which
+would otherwise stretch a 1M-row run to hours.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import openpyxl
+
+from automated_test_ddt import DataDrivenTestEngine, ExcelDataProvider, LoginFormValidator
+from run_log import RunLogger
+
+SHEET_NAME = "LoginTestScenarios"
+
+# Largest sheet measured with tracemalloc unless --memory-max-rows says otherwise
+DEFAULT_MEMORY_MAX_ROWS = 100000
+
+COLUMN_HEADERS = [
+    "TestCaseID",
+    "ScenarioDescription",
+    "InputUsername",
+    "InputPassword",
+    "ExpectedOutcome",
+    "ExpectedMessage",
+    "TestCategory"
+]
+
+# Representative rows, cycled to fill the synthetic sheets
+SCENARIO_TEMPLATES = [
+    ("Valid student credentials", "student", "Password123", "SUCCESS", "Logged In Successfully", "Positive"),
+    ("Valid username with wrong password", "student", "wrongpassword", "FAILURE", "Your password is invalid",
+     "Negative"),
+    ("Invalid username with valid password", "invaliduser", "Password123", "FAILURE", "Your username is invalid",
+     "Negative"),
+    ("SQL injection in username", "student' OR '1'='1", "Password123", "FAILURE", "Your username is invalid",
+     "Security"),
+    ("XSS attempt in username", "<script>alert('xss')</script>", "Password123", "FAILURE",
+     "Your username is invalid", "Security"),
+    ("Very long username", "a" * 300, "Password123", "FAILURE", "Your username is invalid", "Boundary"),
+]
+
+
+def generate_workbook(filepath: str, rows: int):
+    """Writes a synthetic scenario sheet with the given number of data rows"""
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(SHEET_NAME)
+    sheet.append(COLUMN_HEADERS)
+    for index in range(rows):
+        # Vary the inputs a little so memoization cannot hide the validation cost.
+        # Only the field the row expects to be rejected changes, so the row still passes.
+        description, username, password, outcome, message, category = \
+            SCENARIO_TEMPLATES[index % len(SCENARIO_TEMPLATES)]
+        if category == "Negative":
+            if "password" in message:
+                password = f"{password}{index}"
+            else:
+                username = f"{username}{index}"
+        sheet.append([f"TC{index + 1:07d}", description, username, password, outcome, message, category])
+    workbook.save(filepath)
+
+
+@contextlib.contextmanager
+def measure(results: list, rows: int, phase: str, track_memory: bool):
+    """Times the enclosed block and records its peak traced memory"""
+    if track_memory:
+        tracemalloc.reset_peak()
+    started = time.perf_counter()
+    yield
+    seconds = time.perf_counter() - started
+    peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024) if track_memory else None
+    results.append({'rows': rows, 'phase': phase, 'seconds': round(seconds, 4),
+                    'peak_mb': round(peak_mb, 2) if peak_mb is not None else None})
+    memory_display = f"{peak_mb:10.1f} MB" if peak_mb is not None else ""
+    print(f"  {phase:<16}{seconds:10.3f} s{memory_display}", flush=True)
+
+
+def benchmark_size(rows: int, workdir: str, results: list, track_memory: bool):
+    """Runs every phase for one sheet size"""
+    filepath = os.path.join(workdir, f"bench_{rows}.xlsx")
+    print(f"\n{rows:,} rows")
+
+    with measure(results, rows, "generate", track_memory):
+        generate_workbook(filepath, rows)
+
+    # Console output would be measured too; errors still get through
+    log = RunLogger("quiet")
+    provider = ExcelDataProvider(filepath, SHEET_NAME, use_cache=False, log=log)
+    with measure(results, rows, "load", track_memory):
+        scenarios = provider.extract_test_scenarios()
+
+    provider.use_cache = True
+    provider.extract_test_scenarios()  # build the cache
+    with measure(results, rows, "load_cached", track_memory):
+        scenarios = provider.extract_test_scenarios()
+
+    engine = DataDrivenTestEngine(filepath, SHEET_NAME, log_level="quiet")
+    engine._open_run_state()
+    with measure(results, rows, "execute", track_memory):
+        results_for_excel = engine._execute_scenarios(scenarios)
+    engine._finish_run_state()
+    del scenarios
+
+    with measure(results, rows, "write_results", track_memory):
+        engine.data_provider.write_test_results(results_for_excel,
+                                                results_file=os.path.join(workdir, f"bench_{rows}_results.xlsx"))
+
+    with measure(results, rows, "write_back", track_memory):
+        engine.data_provider.initialize_connection()
+        engine.data_provider.write_test_results(results_for_excel)
+        engine.data_provider.close_connection()
+
+
+def compare_with_baseline(results: list, baseline_file: str, tolerance: float) -> list:
+    """Returns descriptions of phases that are slower than the baseline by more than tolerance"""
+    with open(baseline_file, encoding="utf-8") as handle:
+        baseline = {(entry['rows'], entry['phase']): entry for entry in json.load(handle)['results']}
+
+    regressions = []
+    for entry in results:
+        reference = baseline.get((entry['rows'], entry['phase']))
+        if reference is None or reference['seconds'] <= 0:
+            continue
+        ratio = entry['seconds'] / reference['seconds']
+        if ratio > 1 + tolerance:
+            regressions.append(f"{entry['phase']} @ {entry['rows']:,} rows: "
+                               f"{reference['seconds']:.3f}s -> {entry['seconds']:.3f}s ({ratio:.2f}x)")
+    return regressions
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the data-driven test pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Sheet sizes in rows (default: 1000 10000 100000)")
+    parser.add_argument("--output", default="benchmark_results.json",
+                        help="JSON results file (default: benchmark_results.json)")
+    parser.add_argument("--baseline", default=None,
+                        help="Earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed slowdown against the baseline (default: 0.2 = 20%%)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Skip tracemalloc, which slows every phase down noticeably")
+    parser.add_argument("--memory-max-rows", type=int, default=DEFAULT_MEMORY_MAX_ROWS,
+                        help=f"Larger sheets are timed without tracemalloc (default: {DEFAULT_MEMORY_MAX_ROWS})")
+    args = parser.parse_args()
+
+    # Stub out the simulated page load so only pipeline overhead is measured
+    LoginFormValidator.PAGE_LOAD_DELAY = 0
+
+    track_memory = not args.no_memory
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="ddt_bench_") as workdir:
+        for rows in args.sizes:
+            # Untraced sizes report peak_mb as null
+            traced = track_memory and rows <= args.memory_max_rows
+            if traced:
+                tracemalloc.start()
+            try:
+                benchmark_size(rows, workdir, results, traced)
+            finally:
+                if traced:
+                    tracemalloc.stop()
+
+    report = {
+        'timestamp': datetime.now().isoformat(timespec="seconds"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'openpyxl': openpyxl.__version__,
+        'memory_tracked': track_memory,
+        'memory_max_rows': args.memory_max_rows if track_memory else None,
+        'results': results
+    }
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"\n✓ Benchmark results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, args.tolerance)
+        if regressions:
+            print(f"\n✗ {len(regressions)} phase(s) regressed by more than {args.tolerance:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"✓ No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
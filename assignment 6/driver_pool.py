@@ -0,0 +1,127 @@
+"""
+Warm WebDriver Pool
+Starts remote browser sessions in the background as soon as a run begins.
+A hub needs tens of seconds to start a session, and that time now overlaps
+with loading the scenarios and with other browsers' tests. A session worker
+then picks up a driver that is already running instead of creating one.
+
+The pool also enforces the session limit. A slot is taken before a session is
+started and given back when the driver is quit, so idle warm drivers count
+against the hub's parallel-session limit just like busy ones.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from selenium.common.exceptions import WebDriverException
+
+
+class WarmDriverPool:
+    """Pre-started drivers per browser, created on background threads"""
+
+    def __init__(self, create_driver: Callable, max_sessions: int, log=None):
+        """
+        Args:
+            create_driver: Callable(browser_config, session_name) returning a new driver
+            max_sessions: Sessions alive at once, warm or busy
+            log: RunLogger that failures to quit a session are reported to (default: none)
+        """
+        self.create_driver = create_driver
+        self.log = log
+        self.slots = threading.BoundedSemaphore(max_sessions)
+        self._lock = threading.Lock()
+        # Browser name -> deque of (session name, Future of the driver), in start order
+        self._pending = {}
+        # Session names that must not be started any more
+        self._cancelled = set()
+        self._executor = None
+
+    def start(self, sessions: Iterable[Tuple[Dict, str]]):
+        """
+        Starts creating drivers in the background; returns immediately
+
+        Args:
+            sessions: (browser_config, session_name) pairs, in the order slots should go to them
+        """
+        sessions = list(sessions)
+        if not sessions:
+            return
+        # One thread per session: threads waiting for a slot must not hold up the others
+        self._executor = ThreadPoolExecutor(max_workers=len(sessions), thread_name_prefix="warm-driver")
+        with self._lock:
+            for browser_config, session_name in sessions:
+                future = self._executor.submit(self._start_session, browser_config, session_name)
+                self._pending.setdefault(browser_config['name'], deque()).append((session_name, future))
+
+    def acquire(self, browser_name: str) -> Optional[Tuple[object, str]]:
+        """
+        Takes the next warm driver of a browser, waiting until it has started
+
+        Returns:
+            (driver, session name), or None if no session of this browser is left.
+            Raises the driver creation error if the session failed to start.
+        """
+        with self._lock:
+            pending = self._pending.get(browser_name)
+            if not pending:
+                return None
+            session_name, future = pending.popleft()
+        return future.result(), session_name
+
+    def discard(self, browser_name: str, keep: int = 0):
+        """Cancels all but the first `keep` sessions of a browser that nobody has taken yet"""
+        with self._lock:
+            pending = self._pending.get(browser_name)
+            while pending and len(pending) > keep:
+                session_name, future = pending.pop()
+                self._cancelled.add(session_name)
+                future.cancel()
+                # Sessions that are already starting are quit once they are up
+                future.add_done_callback(self._quit_unclaimed)
+
+    def release(self, driver):
+        """Quits a driver taken from the pool and frees its slot, even if the session is already dead"""
+        try:
+            driver.quit()
+        except WebDriverException as error:
+            # Best effort: a deleted or timed-out session cannot be quit, and the hub has ended it anyway
+            if self.log is not None:
+                self.log.error(f"\n✗ Could not quit session cleanly: {error.msg}")
+        finally:
+            self.slots.release()
+
+    def close(self):
+        """Quits every driver nobody has taken and waits for the background threads"""
+        with self._lock:
+            browser_names = list(self._pending)
+        for browser_name in browser_names:
+            self.discard(browser_name)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _start_session(self, browser_config: Dict, session_name: str):
+        self.slots.acquire()
+        with self._lock:
+            cancelled = session_name in self._cancelled
+        if cancelled:
+            self.slots.release()
+            return None
+        try:
+            return self.create_driver(browser_config, session_name)
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def _quit_unclaimed(self, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        driver = future.result()
+        if driver is not None:
+            try:
+                self.release(driver)
+            except Exception:
+                # Best effort: the hub ends idle sessions by itself
+                pass
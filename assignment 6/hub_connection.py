@@ -0,0 +1,139 @@
+"""
+Shared Hub Connections
+By default every webdriver.Remote opens its own HTTP connection pool to the
+hub, so each session pays its own TCP and TLS handshakes. HubConnectionPool
+keeps one bounded pool of keep-alive connections per hub, shared by all of
+its sessions, and counts how many requests reused an open connection and how
+many had to open a new one.
+
+Usage:
+    hub_pool = HubConnectionPool("http://localhost:4444/wd/hub", maxsize=4)
+    driver = webdriver.Remote(command_executor=hub_pool.connection(), options=options)
+    ...
+    print(hub_pool.stats())
+    hub_pool.close()
+
+The pool hooks into private parts of Selenium's RemoteConnection (_conn,
+_get_connection_manager) and of urllib3's PoolManager (_new_pool), last
+checked with Selenium 4.51 and urllib3 2.8. If a release drops one of them,
+HubConnectionPool raises a RuntimeError naming it instead of silently
+falling back to one connection pool per session.
+"""
+
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import selenium
+import urllib3
+from selenium.webdriver.remote.client_config import ClientConfig
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+# Used for hubs without an entry in the per-host settings; maxsize defaults to the session limit
+DEFAULT_POOL_SETTINGS = {'block': True, 'timeout': 120}
+
+
+def hub_pool_settings(hub_url: str, per_host: Dict[str, Dict]) -> Dict:
+    """
+    Returns the connection pool settings for a hub
+
+    Args:
+        hub_url: Hub URL (credentials in it are ignored)
+        per_host: {host name: settings} overriding DEFAULT_POOL_SETTINGS
+    """
+    settings = dict(DEFAULT_POOL_SETTINGS)
+    settings.update(per_host.get(urlsplit(hub_url).hostname, {}))
+    return settings
+
+
+def _require_private_api(available: bool, name: str):
+    """Raises RuntimeError if a private hook the pool relies on is missing"""
+    if not available:
+        raise RuntimeError(
+            f"HubConnectionPool needs {name}, which Selenium {selenium.__version__} / urllib3 "
+            f"{urllib3.__version__} does not provide; install versions that still have it "
+            f"(last checked: Selenium 4.51, urllib3 2.8)")
+
+
+class PooledRemoteConnection(RemoteConnection):
+    """RemoteConnection that sends its commands through a shared HubConnectionPool"""
+
+    def __init__(self, hub_pool: "HubConnectionPool"):
+        self.hub_pool = hub_pool
+        super().__init__(client_config=hub_pool.client_config)
+
+    def _get_connection_manager(self):
+        return self.hub_pool.manager
+
+    def close(self):
+        # Called by driver.quit(); the connections stay open for the other sessions
+        pass
+
+
+class HubConnectionPool:
+    """Bounded keep-alive connections to one hub, shared by all of its sessions"""
+
+    def __init__(self, hub_url: str, maxsize: int = 4, block: bool = True, timeout: float = 120,
+                 ignore_certificates: bool = False, ca_certs: Optional[str] = None,
+                 init_args_for_pool_manager: Optional[Dict] = None):
+        """
+        Args:
+            hub_url: Remote WebDriver hub URL
+            maxsize: Connections kept open per hub host
+            block: Make requests wait for a free connection when all maxsize are busy,
+                   instead of opening extra connections that are closed after use
+            timeout: Seconds to wait for the hub to answer a command
+            ignore_certificates: Skip TLS certificate verification
+            ca_certs: CA bundle (default: REQUESTS_CA_BUNDLE, else certifi, as in Selenium)
+            init_args_for_pool_manager: Further urllib3 pool manager arguments
+        """
+        self.hub_url = hub_url
+        self.maxsize = maxsize
+        self.timeout = timeout
+        pool_args = dict(init_args_for_pool_manager or {}, maxsize=maxsize, block=block)
+        self.client_config = ClientConfig(
+            remote_server_addr=hub_url, keep_alive=True, timeout=timeout,
+            ignore_certificates=ignore_certificates, ca_certs=ca_certs,
+            # RemoteConnection reads the pool manager arguments from this nested key
+            init_args_for_pool_manager={'init_args_for_pool_manager': pool_args}
+        )
+        # Selenium builds the manager: certificates, and a proxy or SOCKS proxy manager
+        # when HTTP(S)_PROXY / ALL_PROXY is set, exactly as for an unpooled driver
+        _require_private_api(callable(getattr(RemoteConnection, "_get_connection_manager", None)),
+                             "RemoteConnection._get_connection_manager")
+        self.manager = getattr(RemoteConnection(client_config=self.client_config), "_conn", None)
+        _require_private_api(self.manager is not None, "RemoteConnection._conn")
+        self._host_pools = []
+        self._count_host_pools()
+
+    def _count_host_pools(self):
+        # Remember every per-host pool the manager creates, for the connection counters
+        new_pool = getattr(self.manager, "_new_pool", None)
+        _require_private_api(callable(new_pool), f"{type(self.manager).__name__}._new_pool")
+
+        def counting_new_pool(*args, **kwargs):
+            pool = new_pool(*args, **kwargs)
+            self._host_pools.append(pool)
+            return pool
+
+        self.manager._new_pool = counting_new_pool
+
+    def connection(self) -> PooledRemoteConnection:
+        """New command executor for webdriver.Remote that uses this pool"""
+        connection = PooledRemoteConnection(self)
+        # The override only takes effect if RemoteConnection still builds _conn through it
+        _require_private_api(getattr(connection, "_conn", None) is self.manager,
+                             "RemoteConnection to build _conn via _get_connection_manager()")
+        return connection
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns: {'requests': HTTP requests sent, 'new': connections opened,
+                  'reused': requests sent over an already open connection}
+        """
+        requests = sum(pool.num_requests for pool in self._host_pools)
+        new = sum(pool.num_connections for pool in self._host_pools)
+        return {'requests': requests, 'new': new, 'reused': max(0, requests - new)}
+
+    def close(self):
+        """Closes every open connection"""
+        self.manager.clear()
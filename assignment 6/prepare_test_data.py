@@ -7,8 +7,87 @@ Valid credentials: Username: student, Password: Password123
 """
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.utils import get_column_letter
 from datetime import datetime
+from itertools import product
+from typing import Dict, Iterator, List, Sequence, Tuple
+import argparse
+import time
+
+# Shared styles: openpyxl deduplicates styles, but building one object per cell is still slow
+HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+HEADER_FONT = Font(bold=True, color="FFFFFF", size=11)
+HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='center')
+SUCCESS_FILL = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
+FAILURE_FILL = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+
+COLUMN_HEADERS = [
+    "TestCaseID",
+    "ScenarioDescription",
+    "InputUsername",
+    "InputPassword",
+    "ExpectedOutcome",
+    "ExpectedMessage",
+    "TestCategory"
+]
+COLUMN_WIDTHS = [12, 35, 30, 20, 18, 30, 15]
+
+VALID_USERNAME = "student"
+VALID_PASSWORD = "Password123"
+
+# Parameter domains for generated scenarios: class name -> value
+USERNAME_CLASSES = {
+    "valid": VALID_USERNAME,
+    "uppercase": "STUDENT",
+    "capitalized": "Student",
+    "trailing space": "student ",
+    "unknown": "invaliduser",
+    "empty": ""
+}
+PASSWORD_CLASSES = {
+    "valid": VALID_PASSWORD,
+    "lowercase": "password123",
+    "wrong": "wrongpassword",
+    "empty": ""
+}
+# Field that the injection, length and encoding mutations are applied to
+MUTATION_TARGETS = {
+    "username": "username",
+    "password": "password"
+}
+INJECTION_PAYLOADS = {
+    "no injection": "",
+    "SQL tautology": "' OR '1'='1",
+    "SQL drop": "'; DROP TABLE users; --",
+    "XSS script": "<script>alert('xss')</script>",
+    "HTML tag": "<b>"
+}
+# Target length in characters; the field is padded with 'x' up to it (None = unchanged)
+FIELD_LENGTHS = {
+    "natural length": None,
+    "at 100-char limit": 100,
+    "over limit": 300
+}
+# Non-ASCII text appended to the field
+ENCODINGS = {
+    "ascii": "",
+    "latin-1": "é",
+    "cyrillic": "д",
+    "cjk": "学生",
+    "emoji": "🔑"
+}
+
+PARAMETER_DOMAINS = [
+    ("username", USERNAME_CLASSES),
+    ("password", PASSWORD_CLASSES),
+    ("target", MUTATION_TARGETS),
+    ("injection", INJECTION_PAYLOADS),
+    ("length", FIELD_LENGTHS),
+    ("encoding", ENCODINGS)
+]
+COVERAGE_STRATEGIES = ("pairwise", "full")
 
 
 def build_test_data_workbook():
@@ -19,8 +98,8 @@ def build_test_data_workbook():
     test_sheet.title = "LoginTestScenarios"
 
     # Define custom styling for professionalism
-    header_style = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=11)
+    header_style = HEADER_FILL
+    header_font = HEADER_FONT
     cell_border = Border(
         left=Side(style='thin'),
         right=Side(style='thin'),
@@ -29,15 +108,7 @@ def build_test_data_workbook():
     )
 
     # Column headers with unique naming
-    column_headers = [
-        "TestCaseID",
-        "ScenarioDescription",
-        "InputUsername",
-        "InputPassword",
-        "ExpectedOutcome",
-        "ExpectedMessage",
-        "TestCategory"
-    ]
+    column_headers = COLUMN_HEADERS
 
     # Apply header formatting
     for col_idx, header_text in enumerate(column_headers, start=1):
@@ -45,7 +116,7 @@ def build_test_data_workbook():
         cell.value = header_text
         cell.fill = header_style
         cell.font = header_font
-        cell.alignment = Alignment(horizontal='center', vertical='center')
+        cell.alignment = HEADER_ALIGNMENT
         cell.border = cell_border
 
     # CORRECTED Test data scenarios - using actual valid credentials
@@ -93,13 +164,10 @@ def build_test_data_workbook():
 
             # Highlight expected outcomes with colors
             if col_idx == 5:  # ExpectedOutcome column
-                if cell_value == "SUCCESS":
-                    cell.fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-                else:
-                    cell.fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+                cell.fill = SUCCESS_FILL if cell_value == "SUCCESS" else FAILURE_FILL
 
     # Auto-adjust column widths
-    column_widths = [12, 35, 30, 20, 18, 30, 15]
+    column_widths = COLUMN_WIDTHS
     for idx, width in enumerate(column_widths, start=1):
         test_sheet.column_dimensions[test_sheet.cell(row=1, column=idx).column_letter].width = width
 
@@ -134,5 +202,182 @@ def build_test_data_workbook():
     print(f"✓ Sheets created: {', '.join(workbook.sheetnames)}")
 
 
+
+def expected_result(username: str, password: str) -> Tuple[str, str]:
+    """
+    Expected (outcome, message) as the live site reports it: the username is
+    checked first, and only an exact "student" / "Password123" pair logs in
+
+    Kept independent of LoginFormValidator on purpose. Rows where the simulator
+    disagrees with the live site fail in the DDT run instead of being hidden.
+    """
+    if username != VALID_USERNAME:
+        return "FAILURE", "Your username is invalid!"
+    if password != VALID_PASSWORD:
+        return "FAILURE", "Your password is invalid!"
+    return "SUCCESS", "Logged In Successfully"
+
+
+def pairwise_combinations(domain_sizes: Sequence[int]) -> Iterator[Tuple[int, ...]]:
+    """
+    Greedy all-pairs covering array: every value pair of every two parameters
+    appears in at least one yielded row. Deterministic for a given input.
+
+    Args:
+        domain_sizes: Number of values of each parameter
+
+    Yields: One tuple of value indices per row
+    """
+    parameter_count = len(domain_sizes)
+    uncovered = {(i, a, j, b)
+                 for i in range(parameter_count) for j in range(i + 1, parameter_count)
+                 for a in range(domain_sizes[i]) for b in range(domain_sizes[j])}
+
+    while uncovered:
+        # Seed the row with the smallest uncovered pair, then fill the other
+        # parameters with the values that cover the most uncovered pairs
+        i, a, j, b = min(uncovered)
+        row = [None] * parameter_count
+        row[i], row[j] = a, b
+        for k in range(parameter_count):
+            if row[k] is not None:
+                continue
+            best_value, best_gain = 0, -1
+            for value in range(domain_sizes[k]):
+                gain = sum(1 for m in range(parameter_count)
+                           if row[m] is not None
+                           and ((m, row[m], k, value) if m < k else (k, value, m, row[m])) in uncovered)
+                if gain > best_gain:
+                    best_value, best_gain = value, gain
+            row[k] = best_value
+
+        uncovered.difference_update((m, row[m], n, row[n])
+                                    for m in range(parameter_count) for n in range(m + 1, parameter_count))
+        yield tuple(row)
+
+
+def _build_scenario(choice: Dict[str, str]) -> List:
+    """Turns one choice of parameter classes into a scenario row (without the id)"""
+    values = {
+        'username': USERNAME_CLASSES[choice['username']],
+        'password': PASSWORD_CLASSES[choice['password']]
+    }
+    target = MUTATION_TARGETS[choice['target']]
+    value = values[target] + INJECTION_PAYLOADS[choice['injection']] + ENCODINGS[choice['encoding']]
+    length = FIELD_LENGTHS[choice['length']]
+    if length is not None and len(value) < length:
+        value += "x" * (length - len(value))
+    values[target] = value
+
+    outcome, message = expected_result(values['username'], values['password'])
+    if outcome == "SUCCESS":
+        category = "Positive"
+    elif choice['injection'] != "no injection":
+        category = "Security"
+    elif choice['length'] != "natural length" or choice['encoding'] != "ascii":
+        category = "Boundary"
+    else:
+        category = "Negative"
+
+    description = (f"{choice['username']} username, {choice['password']} password; "
+                   f"{target}: {choice['injection']}, {choice['length']}, {choice['encoding']}")
+    return [description, values['username'], values['password'], outcome, message, category]
+
+
+def generate_scenarios(strategy: str = "pairwise", rows: int = None) -> Iterator[List]:
+    """
+    Yields generated scenario rows (in COLUMN_HEADERS order)
+
+    Args:
+        strategy: "pairwise" covers every pair of parameter values,
+                  "full" every combination
+        rows: Total rows; the covering set is repeated (with fresh ids) to reach it.
+              Default: the covering set once.
+    """
+    if strategy not in COVERAGE_STRATEGIES:
+        raise ValueError(f"strategy must be one of {COVERAGE_STRATEGIES}, got {strategy!r}")
+
+    names = [name for name, _ in PARAMETER_DOMAINS]
+    classes = [list(domain) for _, domain in PARAMETER_DOMAINS]
+    if strategy == "full":
+        combinations = product(*(range(len(values)) for values in classes))
+    else:
+        combinations = pairwise_combinations([len(values) for values in classes])
+
+    # The covering set is small; build it once and cycle over it
+    covering_set = [_build_scenario({name: classes[k][index] for k, (name, index) in
+                                     enumerate(zip(names, combination))})
+                    for combination in combinations]
+    total = len(covering_set) if rows is None else rows
+    for index in range(total):
+        yield [f"GEN{index + 1:07d}"] + covering_set[index % len(covering_set)]
+
+
+def write_scenario_workbook(filepath: str, scenarios: Iterator[List],
+                            sheet_name: str = "LoginTestScenarios") -> int:
+    """
+    Streams scenario rows into a write-only workbook with shared styles
+
+    Returns: Number of scenario rows written
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    for idx, width in enumerate(COLUMN_WIDTHS, start=1):
+        sheet.column_dimensions[get_column_letter(idx)].width = width
+
+    header = []
+    for title in COLUMN_HEADERS:
+        cell = WriteOnlyCell(sheet, value=title)
+        cell.fill = HEADER_FILL
+        cell.font = HEADER_FONT
+        cell.alignment = HEADER_ALIGNMENT
+        header.append(cell)
+    sheet.append(header)
+
+    # Only the outcome cell is styled. Write-only rows are serialized on append,
+    # so one pre-styled cell per outcome can be reused for every row.
+    outcome_cells = {}
+    for outcome, fill in (("SUCCESS", SUCCESS_FILL), ("FAILURE", FAILURE_FILL)):
+        outcome_cells[outcome] = WriteOnlyCell(sheet, value=outcome)
+        outcome_cells[outcome].fill = fill
+
+    rows_written = 0
+    for scenario in scenarios:
+        scenario[4] = outcome_cells[scenario[4]]
+        sheet.append(scenario)
+        rows_written += 1
+
+    metadata_sheet = workbook.create_sheet("TestMetadata")
+    metadata_sheet.append(["Property", "Value"])
+    metadata_sheet.append(["Test Suite", "Login Functionality Testing (generated)"])
+    metadata_sheet.append(["Created Date", datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
+    metadata_sheet.append(["Target Website", "https://practicetestautomation.com/practice-test-login/"])
+    metadata_sheet.append(["Total Test Cases", rows_written])
+
+    workbook.save(filepath)
+    return rows_written
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Create the login test data workbook")
+    parser.add_argument("--generate", choices=COVERAGE_STRATEGIES, default=None,
+                        help="Generate scenarios from parameter domains instead of the 15 hand-written ones")
+    parser.add_argument("--rows", type=int, default=None,
+                        help="Rows to generate; the covering set is repeated to reach it (default: one set)")
+    parser.add_argument("--output", default="test_data.xlsx",
+                        help="Workbook to write for --generate (default: test_data.xlsx)")
+    args = parser.parse_args()
+
+    if args.generate is None:
+        build_test_data_workbook()
+        return
+
+    started = time.perf_counter()
+    rows_written = write_scenario_workbook(args.output, generate_scenarios(args.generate, args.rows))
+    print(f"✓ Generated {rows_written} {args.generate} scenarios in {time.perf_counter() - started:.1f}s")
+    print(f"✓ Test data file created successfully: {args.output}")
+
+
 if __name__ == "__main__":
-    build_test_data_workbook()
\ No newline at end of file
+    main()
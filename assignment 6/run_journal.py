@@ -0,0 +1,172 @@
+"""
+Checkpoint Journal and Result Cache
+Lets long test runs resume after a crash and skip scenarios that have not
+changed since they last passed.
+
+CheckpointJournal - append-only JSON-lines file with one entry per finished
+                    scenario; a restarted run replays it instead of re-running.
+                    Entries are flushed in groups (every FLUSH_EVERY entries or
+                    FLUSH_INTERVAL seconds) and on close or exit, so a hard
+                    crash loses at most the last group, which is then re-run
+ResultCache       - passing results keyed by (scenario inputs, validator/target
+                    version), kept across runs
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+# Scenario columns that define a test; result columns written back into the sheet are ignored
+SCENARIO_INPUT_FIELDS = (
+    "TestCaseID",
+    "InputUsername",
+    "InputPassword",
+    "ExpectedOutcome",
+    "ExpectedMessage",
+    "TestCategory"
+)
+
+
+def scenario_fingerprint(scenario: Dict, version: str, fields: Iterable[str] = SCENARIO_INPUT_FIELDS) -> str:
+    """
+    Returns a stable key for a scenario's inputs under a given validator/target version
+
+    Args:
+        scenario: Scenario dictionary as loaded from Excel
+        version: Anything that changes the expected outcome (validator rules, target site, browser)
+        fields: Scenario columns that make up the key
+    """
+    payload = json.dumps([version] + [str(scenario.get(field, "")) for field in fields], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CheckpointJournal:
+    """Append-only journal of finished scenarios for one run"""
+
+    # Entries written before the buffer is flushed to the OS, at the latest
+    FLUSH_EVERY = 100
+    # Seconds after which pending entries are flushed, however few there are
+    FLUSH_INTERVAL = 1.0
+
+    def __init__(self, filepath: str, resume: bool = True):
+        """
+        Args:
+            filepath: Journal file (JSON lines)
+            resume: Load entries left by an interrupted run; otherwise start empty
+        """
+        self.filepath = filepath
+        self.entries = {}
+        if resume:
+            self._load()
+        self._handle = open(filepath, "a" if resume else "w", encoding="utf-8")
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+        # Interrupted runs (Ctrl+C, sys.exit, SIGTERM via exit_on_sigterm) keep what they finished
+        atexit.register(self.flush)
+
+    def _load(self):
+        try:
+            with open(self.filepath, encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A crash can leave a torn last line; everything before it is still valid
+                        continue
+                    self.entries[entry["key"]] = (entry["result"], entry["details"])
+        except FileNotFoundError:
+            pass
+
+    def lookup(self, key: str) -> Optional[Tuple[Dict, str]]:
+        """Returns (result, details) recorded for key by an earlier attempt, if any"""
+        return self.entries.get(key)
+
+    def record(self, key: str, result: Dict, details: str):
+        """Appends a finished scenario; entries reach the file in groups (see FLUSH_EVERY)"""
+        self._handle.write(json.dumps({"key": key, "result": result, "details": details},
+                                      ensure_ascii=False, default=str) + "\n")
+        self._unflushed += 1
+        if self._unflushed >= self.FLUSH_EVERY or time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """Hands pending entries to the OS"""
+        if self._handle.closed:
+            return
+        self._handle.flush()
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def complete(self):
+        """Closes and removes the journal once the run has finished cleanly"""
+        self.close()
+        try:
+            os.remove(self.filepath)
+        except FileNotFoundError:
+            pass
+
+    def close(self):
+        """Closes the journal but keeps it on disk so the run can be resumed"""
+        if not self._handle.closed:
+            self._handle.close()
+        atexit.unregister(self.flush)
+
+
+def exit_on_sigterm():
+    """
+    Turns SIGTERM (e.g. a CI job being cancelled) into a normal exit, so atexit
+    handlers flush the journal; call from a runner's main thread
+    """
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+
+
+class ResultCache:
+    """Passing results from earlier runs, keyed by scenario fingerprint"""
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.entries = {}
+        self._dirty = False
+        try:
+            with open(filepath, encoding="utf-8") as handle:
+                self.entries = json.load(handle)
+        except (FileNotFoundError, ValueError):
+            self.entries = {}
+
+    def lookup(self, key: str) -> Optional[Tuple[Dict, str]]:
+        """Returns (result, details) of the last green run of this scenario, if any"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        return entry["result"], entry["details"]
+
+    def store(self, key: str, result: Dict, details: str, passed: bool):
+        """Remembers passing results and forgets failing ones"""
+        if passed:
+            self.entries[key] = {"result": result, "details": details}
+            self._dirty = True
+        elif self.entries.pop(key, None) is not None:
+            self._dirty = True
+
+    def save(self):
+        """Writes the cache atomically if anything changed"""
+        if not self._dirty:
+            return
+        temp_path = f"{self.filepath}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(self.entries, handle, ensure_ascii=False, default=str)
+        os.replace(temp_path, self.filepath)
+        self._dirty = False
+
+
+def run_state_path(filepath: str, sheet_name: str, suffix: str) -> str:
+    """Returns a hidden state file path next to the workbook, e.g. .test_data.xlsx.Sheet.journal.jsonl"""
+    directory, filename = os.path.split(os.path.abspath(filepath))
+    return os.path.join(directory, f".{filename}.{sheet_name}.{suffix}")
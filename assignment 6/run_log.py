@@ -0,0 +1,169 @@
+"""
+Buffered Structured Run Logging
+Replaces per-scenario print() calls in the test runners. Callers only put
+records on a queue; a background writer thread formats them, writes them to
+the console in batches and, optionally, to a JSON-lines file.
+
+Console levels:
+    quiet   - errors only
+    summary - banners, progress and the final summary (default)
+    verbose - additionally one block per scenario and the detailed results table
+
+The JSON-lines file receives every record regardless of the console level.
+"""
+
+import atexit
+import json
+import queue
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+LOG_LEVELS = ("quiet", "summary", "verbose")
+
+# Records written at "error" level reach the console even when quiet
+_LEVEL_RANKS = {"error": 0, "summary": 1, "verbose": 2}
+
+_STOP = object()
+
+
+class RunLogger:
+    """Queues log records and writes them from a background thread"""
+
+    # Console writes are batched: up to this many records per write() call
+    MAX_BATCH = 512
+
+    def __init__(self, level: str = "summary", json_file: Optional[str] = None, stream=None):
+        """
+        Args:
+            level: Console level, one of LOG_LEVELS
+            json_file: Also write every record to this JSON-lines file
+            stream: Console stream (default: sys.stdout at construction time)
+        """
+        if level not in LOG_LEVELS:
+            raise ValueError(f"level must be one of {LOG_LEVELS}, got {level!r}")
+        self.level = level
+        self.json_file = json_file
+        self.stream = stream if stream is not None else sys.stdout
+        self._console_rank = LOG_LEVELS.index(level)
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._json_handle = None
+
+    def enabled(self, level: str) -> bool:
+        """True if records at this level reach the console"""
+        return _LEVEL_RANKS[level] <= self._console_rank
+
+    def info(self, message: str = "", level: str = "summary"):
+        """Logs a line of console text"""
+        if self.json_file is None and not self.enabled(level):
+            return
+        self._put((time.time(), level, "message", {'text': message}, None))
+
+    def detail(self, message: str = ""):
+        """Logs a line of console text shown only at verbose level"""
+        self.info(message, level="verbose")
+
+    def error(self, message: str):
+        """Logs an error; shown at every level"""
+        self.info(message, level="error")
+
+    def event(self, kind: str, fields: Dict, level: str = "verbose",
+              render: Callable[[Dict], str] = None):
+        """
+        Logs a structured record
+
+        Args:
+            kind: Record type, written as the "event" field of the JSON line
+            fields: Record payload; must not be mutated after the call
+            level: Console level at which render(fields) is shown
+            render: Formats the record for the console on the writer thread
+        """
+        if self.json_file is None and (render is None or not self.enabled(level)):
+            return
+        self._put((time.time(), level, kind, fields, render))
+
+    def flush(self):
+        """Blocks until every record queued so far has been written"""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        """Writes the remaining records and stops the writer thread"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        atexit.unregister(self.close)
+
+    def _put(self, record):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="run-log-writer", daemon=True)
+                    self._thread.start()
+                    # Early returns and crashes must not lose buffered output
+                    atexit.register(self.close)
+        self._queue.put(record)
+
+    def _run(self):
+        if self.json_file is not None and self._json_handle is None:
+            self._json_handle = open(self.json_file, "a", encoding="utf-8")
+        try:
+            stopping = False
+            while not stopping:
+                batch = [self._queue.get()]
+                while len(batch) < self.MAX_BATCH:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                console_lines, json_lines, waiters = [], [], []
+                for record in batch:
+                    if record is _STOP:
+                        stopping = True
+                        continue
+                    if isinstance(record, threading.Event):
+                        waiters.append(record)
+                        continue
+                    self._format(record, console_lines, json_lines)
+
+                try:
+                    if console_lines and self.stream is not None:
+                        self.stream.write("\n".join(console_lines) + "\n")
+                        self.stream.flush()
+                except (OSError, ValueError):
+                    # Closed or broken console (e.g. piped into head): keep the JSON log going
+                    self.stream = None
+                finally:
+                    if json_lines:
+                        self._json_handle.write("".join(json_lines))
+                        self._json_handle.flush()
+                    for waiter in waiters:
+                        waiter.set()
+        finally:
+            if self._json_handle is not None:
+                self._json_handle.close()
+                self._json_handle = None
+
+    def _format(self, record, console_lines, json_lines):
+        timestamp, level, kind, fields, render = record
+        if self.enabled(level):
+            if kind == "message":
+                console_lines.append(fields['text'])
+            elif render is not None:
+                try:
+                    console_lines.append(render(fields))
+                except Exception as error:
+                    console_lines.append(f"[{kind}] could not be formatted: {error!r}")
+        if self._json_handle is not None:
+            entry = {'ts': round(timestamp, 6), 'level': level, 'event': kind}
+            entry.update(fields)
+            json_lines.append(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
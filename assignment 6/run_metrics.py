@@ -0,0 +1,201 @@
+"""
+Phase Timing, Profiling and Metrics Export
+Breaks a test run down into named phases (data loading, driver creation,
+scenario execution, summary, Excel save) and writes one JSON metrics file
+per run for dashboards.
+
+Each phase can optionally be profiled:
+    cprofile - deterministic cProfile, one .prof file per phase
+    sampling - low-overhead stack sampler, one collapsed-stack .txt file per
+               phase (flamegraph.pl / speedscope format)
+
+Only one cProfile can be active per process on Python 3.12+, so cprofile
+profiles phases on the main thread only; phases on other threads (e.g.
+concurrent browser sessions) are sampled instead.
+
+Phases may run concurrently on several threads. Their "seconds" add up the
+time of every call; "wall_seconds" splits each moment of wall time evenly
+between the phases active at that moment, so shares of the run add up to at
+most 100%.
+"""
+
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict
+
+PROFILERS = ("cprofile", "sampling")
+
+
+class StackSampler:
+    """Samples one thread's call stack at a fixed interval from a background thread"""
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def dump(self, filepath: str):
+        """Writes collapsed stacks ("frame;frame;frame count" per line)"""
+        with open(filepath, "w", encoding="utf-8") as handle:
+            for stack, count in self.stacks.most_common():
+                handle.write(f"{stack} {count}\n")
+
+
+class PhaseTimer:
+    """Accumulates wall time per named phase and exports it as JSON"""
+
+    def __init__(self, run_name: str, profiler: str = None, output_dir: str = "metrics"):
+        """
+        Args:
+            run_name: Prefix for the metrics and profile files (e.g. "ddt", "ddt_shard1of4");
+                      sharded runs include their shard so concurrent shards never collide
+            profiler: None, "cprofile" or "sampling"
+            output_dir: Directory for the metrics JSON and profile dumps
+        """
+        if profiler is not None and profiler not in PROFILERS:
+            raise ValueError(f"profiler must be one of {PROFILERS}, got {profiler!r}")
+        self.run_name = run_name
+        self.profiler = profiler
+        self.output_dir = output_dir
+        self.started_at = datetime.now()
+        # Microseconds and the pid keep runs started in the same second apart
+        self.run_id = f"{self.started_at.strftime('%Y%m%d_%H%M%S_%f')}_{os.getpid()}"
+        self._started = time.perf_counter()
+        self.phases = {}
+        self.profile_files = []
+        self._lock = threading.Lock()
+        # Running calls per phase name, for splitting wall time between concurrent phases
+        self._active = Counter()
+        self._last_event = self._started
+        # Profile files written per phase name; numbers are reserved when a phase starts
+        self._profile_counts = Counter()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Times (and optionally profiles) the enclosed block under the given phase name"""
+        profile = sampler = None
+        if self.profiler == "cprofile" and threading.current_thread() is threading.main_thread():
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler is already active (Python 3.12+): sample instead
+                profile = None
+        if self.profiler is not None and profile is None:
+            sampler = StackSampler(threading.get_ident())
+            sampler.start()
+
+        started = time.perf_counter()
+        with self._lock:
+            self._advance_wall(started)
+            self._active[name] += 1
+            self.phases.setdefault(name, {'seconds': 0.0, 'wall_seconds': 0.0, 'calls': 0})
+            if self.profiler is not None:
+                self._profile_counts[name] += 1
+                sequence = self._profile_counts[name]
+        try:
+            yield
+        finally:
+            finished = time.perf_counter()
+            if profile is not None:
+                profile.disable()
+                self._save_profile(name, sequence, "prof", profile.dump_stats)
+            if sampler is not None:
+                sampler.stop()
+                self._save_profile(name, sequence, "txt", sampler.dump)
+            with self._lock:
+                self._advance_wall(finished)
+                self._active[name] -= 1
+                entry = self.phases[name]
+                entry['seconds'] += finished - started
+                entry['calls'] += 1
+
+    def _advance_wall(self, now: float):
+        """Splits the wall time since the last phase start or end between the active phases; lock held"""
+        active = [name for name, count in self._active.items() if count > 0]
+        if active:
+            share = (now - self._last_event) / len(active)
+            for name in active:
+                self.phases[name]['wall_seconds'] += share
+        self._last_event = now
+
+    def _save_profile(self, phase_name: str, sequence: int, extension: str, dump):
+        os.makedirs(self.output_dir, exist_ok=True)
+        filepath = os.path.join(self.output_dir,
+                                f"{self.run_name}_{self.run_id}_{phase_name}_{sequence}.{extension}")
+        dump(filepath)
+        with self._lock:
+            self.profile_files.append(filepath)
+
+    def summary_lines(self):
+        """Human-readable phase breakdown"""
+        now = time.perf_counter()
+        total = now - self._started
+        with self._lock:
+            self._advance_wall(now)
+            phases = {name: dict(entry) for name, entry in self.phases.items()}
+        lines = [f"  {'Phase':<22}{'Seconds':>10}{'Calls':>8}{'Wall s':>10}{'Share':>9}"]
+        for name, entry in phases.items():
+            share = entry['wall_seconds'] / total * 100 if total > 0 else 0
+            lines.append(f"  {name:<22}{entry['seconds']:>10.3f}{entry['calls']:>8}"
+                         f"{entry['wall_seconds']:>10.3f}{share:>8.1f}%")
+        return lines
+
+    def export(self, extra: Dict = None) -> str:
+        """
+        Writes <output_dir>/<run_name>_<run id>.json and returns its path
+
+        Args:
+            extra: Additional run metrics (counts, latency statistics, settings)
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        now = time.perf_counter()
+        with self._lock:
+            self._advance_wall(now)
+        metrics = {
+            'run': self.run_name,
+            'run_id': self.run_id,
+            'started_at': self.started_at.isoformat(timespec="seconds"),
+            'finished_at': datetime.now().isoformat(timespec="seconds"),
+            'total_seconds': round(now - self._started, 6),
+            'phases': {name: {'seconds': round(entry['seconds'], 6),
+                              'wall_seconds': round(entry['wall_seconds'], 6),
+                              'calls': entry['calls']}
+                       for name, entry in self.phases.items()},
+            'profiler': self.profiler,
+            'profile_files': self.profile_files,
+        }
+        if extra:
+            metrics.update(extra)
+        filepath = os.path.join(self.output_dir, f"{self.run_name}_{self.run_id}.json")
+        with open(filepath, "w", encoding="utf-8") as handle:
+            json.dump(metrics, handle, indent=2, default=str)
+        return filepath
@@ -0,0 +1,175 @@
+"""
+Shared Test Scenario Loader
+Reads login test scenarios from the Excel workbook for both the local
+data-driven engine and the BrowserStack runner.
+
+Parsed scenarios are cached in a compact pickle next to the workbook
+(.<workbook>.<sheet>.scenarios.cache). The cache is keyed by the file's
+size and mtime, falling back to a SHA-256 of its content, so warm starts
+never touch openpyxl and the sheet is only re-parsed when it changes.
+Writers that save the workbook from an open worksheet call refresh_cache(),
+so their own write does not count as a change.
+"""
+
+import hashlib
+import os
+import pickle
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Bump when the cached layout changes so old caches are rebuilt
+CACHE_FORMAT_VERSION = 1
+
+
+def cache_path_for(filepath: str, sheet_name: str) -> str:
+    """Returns the cache file path used for a workbook/sheet pair"""
+    directory, filename = os.path.split(os.path.abspath(filepath))
+    return os.path.join(directory, f".{filename}.{sheet_name}.scenarios.cache")
+
+
+def load_test_scenarios(filepath: str, sheet_name: str, use_cache: bool = True) -> List[Dict]:
+    """
+    Loads test scenarios as a list of {header: value} dictionaries
+
+    Empty cells become "" and fully blank rows are skipped.
+
+    Args:
+        filepath: Path to the scenario workbook
+        sheet_name: Worksheet holding the scenarios
+        use_cache: Read/refresh the on-disk cache instead of always parsing the workbook
+    """
+    if not use_cache:
+        headers, rows = _parse_workbook(filepath, sheet_name)
+        return _to_scenarios(headers, rows)
+
+    stat = os.stat(filepath)
+    cache_path = cache_path_for(filepath, sheet_name)
+    cached = _read_cache(cache_path)
+
+    if cached is not None and cached['size'] == stat.st_size:
+        if cached['mtime_ns'] == stat.st_mtime_ns:
+            return _to_scenarios(cached['headers'], cached['rows'])
+
+        # Touched but possibly unchanged (e.g. a fresh checkout): compare content
+        content_hash = _hash_file(filepath)
+        if cached['sha256'] == content_hash:
+            cached['mtime_ns'] = stat.st_mtime_ns
+            _write_cache(cache_path, cached)
+            return _to_scenarios(cached['headers'], cached['rows'])
+    else:
+        content_hash = _hash_file(filepath)
+
+    headers, rows = _parse_workbook(filepath, sheet_name)
+    _write_cache(cache_path, _cache_entry(sheet_name, stat, content_hash, headers, rows))
+    return _to_scenarios(headers, rows)
+
+
+def refresh_cache(filepath: str, sheet_name: str, sheet_rows: Iterable[tuple]):
+    """
+    Records an already-parsed sheet as the cache entry for the workbook as it is now
+
+    For callers that have just saved the workbook from an open worksheet (e.g. a
+    result write-back): their own write then does not force the next start to
+    parse the sheet again.
+
+    Args:
+        filepath: Path to the workbook that was just saved
+        sheet_name: Worksheet the rows belong to
+        sheet_rows: The sheet's rows as value tuples, header row first
+    """
+    headers, rows = _split_rows(iter(sheet_rows))
+    stat = os.stat(filepath)
+    _write_cache(cache_path_for(filepath, sheet_name),
+                 _cache_entry(sheet_name, stat, _hash_file(filepath), headers, rows))
+
+
+def _cache_entry(sheet_name: str, stat: os.stat_result, content_hash: str, headers, rows) -> Dict:
+    return {
+        'version': CACHE_FORMAT_VERSION,
+        'sheet': sheet_name,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': content_hash,
+        'headers': headers,
+        'rows': rows
+    }
+
+
+def _parse_workbook(filepath: str, sheet_name: str):
+    """Parses the sheet into a header tuple and a list of row tuples"""
+    import openpyxl  # only needed on a cold start
+
+    workbook = openpyxl.load_workbook(filepath, read_only=True)
+    try:
+        return _split_rows(workbook[sheet_name].iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+
+def _split_rows(rows: Iterator[tuple]):
+    """Splits sheet rows into a header tuple and data row tuples (blank rows dropped)"""
+    headers = next(rows, None)
+    if headers is None:
+        return (), []
+    data_rows = [
+        tuple("" if value is None else value for value in row)
+        for row in rows
+        if any(value is not None for value in row)
+    ]
+    return tuple(headers), data_rows
+
+
+def _to_scenarios(headers, rows) -> List[Dict]:
+    return [dict(zip(headers, row)) for row in rows]
+
+
+def _hash_file(filepath: str) -> str:
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as handle:
+        for block in iter(lambda: handle.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_cache(cache_path: str) -> Optional[Dict]:
+    """
+    Returns the cached payload, or None if it is missing, stale or unreadable
+
+    A cache read is never fatal: a truncated or corrupted pickle can raise almost
+    anything (TypeError, OverflowError, MemoryError, KeyError, ...), so every
+    error counts as a miss and the broken file is removed.
+    """
+    try:
+        with open(cache_path, 'rb') as handle:
+            cached = pickle.load(handle)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        _remove_cache(cache_path)
+        return None
+    if not isinstance(cached, dict) or cached.get('version') != CACHE_FORMAT_VERSION:
+        return None
+    if not {'size', 'mtime_ns', 'sha256', 'headers', 'rows'} <= cached.keys():
+        _remove_cache(cache_path)
+        return None
+    return cached
+
+
+def _remove_cache(cache_path: str):
+    try:
+        os.remove(cache_path)
+    except OSError:
+        pass
+
+
+def _write_cache(cache_path: str, payload: Dict):
+    """Writes the cache atomically; a failed write only costs the next start a re-parse"""
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as handle:
+            pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
@@ -0,0 +1,43 @@
+"""
+Deterministic Scenario Sharding
+Splits a scenario sheet across processes or CI agents. A scenario's shard is
+derived from a SHA-256 of its TestCaseID, so every agent computes the same
+split independently, regardless of row order or Python's hash seed.
+"""
+
+import hashlib
+from typing import Dict, Iterable, Iterator
+
+
+def shard_of(test_id, shard_count: int) -> int:
+    """Returns the 0-based shard a test case id belongs to"""
+    digest = hashlib.sha256(str(test_id).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shard_count
+
+
+def validate_shard(shard_index: int, shard_count: int):
+    """Raises ValueError unless 0 <= shard_index < shard_count"""
+    if shard_count < 1:
+        raise ValueError(f"shard_count must be at least 1, got {shard_count}")
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(f"shard_index must be in [0, {shard_count}), got {shard_index}")
+
+
+def select_shard(scenarios: Iterable[Dict], shard_index: int, shard_count: int) -> Iterator[Dict]:
+    """
+    Lazily yields the scenarios that belong to one shard
+
+    Args:
+        scenarios: Scenario dictionaries with a TestCaseID column
+        shard_index: 0-based index of this shard
+        shard_count: Total number of shards
+    """
+    validate_shard(shard_index, shard_count)
+    for scenario in scenarios:
+        if shard_of(scenario.get('TestCaseID', ''), shard_count) == shard_index:
+            yield scenario
+
+
+def shard_suffix(shard_index: int, shard_count: int) -> str:
+    """File name suffix for per-shard outputs, e.g. 'shard1of4' (1-based for readability)"""
+    return f"shard{shard_index + 1}of{shard_count}"
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Local Stand-In WebDriver Hub
+A small HTTP/1.1 server that speaks enough of the W3C WebDriver protocol to
+run the BrowserStack runner's login flow against it: sessions, navigation,
+element lookup, clear/sendKeys/click, element text and the scripted-mode
+scripts. It emulates the practice login page (student / Password123), so no
+browser, no BrowserStack account and no network are needed.
+
+Serve it and point the runner at it:
+    python stand_in_hub.py --port 4444
+    python automated_test_browserstack.py --hub-url http://127.0.0.1:4444/wd/hub
+
+Or run the self-check, which runs the runner against a stand-in on a free
+port and verifies that every scenario got an outcome and that the shared hub
+connection pool reused its connections:
+    python stand_in_hub.py --check
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+VALID_USERNAME = "student"
+VALID_PASSWORD = "Password123"
+
+# Elements of the emulated page, by the locator values the runner uses
+ELEMENT_IDS = {'username', 'password', 'submit', 'error'}
+SUCCESS_TITLE = "post-title"
+
+
+class StandInSession:
+    """State of the emulated login page in one session"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.fields = {'username': "", 'password': ""}
+        self.outcome = None
+
+    def submit(self):
+        if self.fields['username'] != VALID_USERNAME:
+            self.outcome = ("FAILURE", "Your username is invalid!")
+        elif self.fields['password'] != VALID_PASSWORD:
+            self.outcome = ("FAILURE", "Your password is invalid!")
+        else:
+            self.outcome = ("SUCCESS", "Logged In Successfully")
+
+    def find(self, using, value):
+        """Element ids matching a locator; the success title only exists after a login"""
+        if using == "css selector":
+            match = re.fullmatch(r'\[id="([^"]+)"\]|#([\w-]+)', value)
+            if match:
+                element_id = match.group(1) or match.group(2)
+                return [element_id] if element_id in ELEMENT_IDS else []
+            if value == f".{SUCCESS_TITLE}":
+                return [SUCCESS_TITLE] if self.outcome and self.outcome[0] == "SUCCESS" else []
+        return []
+
+    def text(self, element_id):
+        if element_id == SUCCESS_TITLE and self.outcome:
+            return "Logged In Successfully"
+        if element_id == "error" and self.outcome and self.outcome[0] == "FAILURE":
+            return self.outcome[1]
+        return ""
+
+
+class StandInHubHandler(BaseHTTPRequestHandler):
+    """W3C WebDriver endpoints of the stand-in hub"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in one write; separate small writes stall on delayed ACKs
+    wbufsize = 65536
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        path = self.path.split("/session", 1)
+        if len(path) == 1:
+            return self._reply({'ready': True, 'message': "stand-in hub"}) if self.path.endswith("/status") \
+                else self._error(404, "unknown command", self.path)
+        parts = [part for part in path[1].split("/") if part]
+
+        if not parts and method == "POST":
+            session_id = uuid.uuid4().hex
+            self.server.sessions[session_id] = StandInSession()
+            return self._reply({'sessionId': session_id, 'capabilities': {'browserName': "stand-in"}})
+
+        session = self.server.sessions.get(parts[0]) if parts else None
+        if session is None:
+            return self._error(404, "invalid session id", self.path)
+        command = parts[1:]
+
+        with session.lock:
+            if not command and method == "DELETE":
+                del self.server.sessions[parts[0]]
+                return self._reply(None)
+            if command == ["url"]:
+                session.reset()
+                return self._reply(None)
+            if command in (["element"], ["elements"]):
+                found = session.find(body.get('using'), body.get('value', ""))
+                if command == ["elements"]:
+                    return self._reply([{ELEMENT_KEY: element_id} for element_id in found])
+                if not found:
+                    return self._error(404, "no such element", body.get('value', ""))
+                return self._reply({ELEMENT_KEY: found[0]})
+            if len(command) == 3 and command[0] == "element":
+                return self._element_command(session, command[1], command[2], method, body)
+            if command == ["execute", "sync"]:
+                # Scripted mode, step 1: fill the form and submit
+                args = body.get('args', [])
+                if len(args) >= 2:
+                    session.fields = {'username': args[0], 'password': args[1]}
+                    session.submit()
+                return self._reply(True)
+            if command == ["execute", "async"]:
+                # Scripted mode, step 2: the outcome
+                return self._reply(list(session.outcome) if session.outcome else None)
+            if command == ["timeouts"]:
+                return self._reply(None)
+        return self._error(404, "unknown command", self.path)
+
+    def _element_command(self, session, element_id, action, method, body):
+        if action == "clear" and element_id in session.fields:
+            session.fields[element_id] = ""
+            return self._reply(None)
+        if action == "value" and element_id in session.fields:
+            session.fields[element_id] += body.get('text', "")
+            return self._reply(None)
+        if action == "click":
+            if element_id == "submit":
+                session.submit()
+            return self._reply(None)
+        if action == "text" and method == "GET":
+            return self._reply(session.text(element_id))
+        return self._error(404, "unknown command", self.path)
+
+    def _reply(self, value, status=200):
+        payload = json.dumps({'value': value}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        self.wfile.flush()
+
+    def _error(self, status, error, message):
+        self._reply({'error': error, 'message': message, 'stacktrace': ""}, status=status)
+
+
+class StandInHub(ThreadingHTTPServer):
+    """Stand-in hub server; port 0 picks a free port"""
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0):
+        super().__init__((host, port), StandInHubHandler)
+        self.latency = latency
+        self.sessions = {}
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/wd/hub"
+
+    def start(self):
+        """Serves on a background thread; returns self"""
+        threading.Thread(target=self.serve_forever, name="stand-in-hub", daemon=True).start()
+        return self
+
+
+def run_check(latency):
+    """
+    Runs the BrowserStack runner against a stand-in hub and checks the run metrics
+
+    The run happens in a temporary copy of test_data.xlsx, so its journal,
+    results and metrics files do not land next to the real workbook.
+
+    Returns: True if every scenario matched its expected outcome and the hub
+             connections were reused
+    """
+    from automated_test_browserstack import BrowserStackTestRunner
+
+    workbook = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_data.xlsx")
+    hub = StandInHub(latency=latency).start()
+    original_dir = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            shutil.copy(workbook, work_dir)
+            os.chdir(work_dir)
+            runner = BrowserStackTestRunner(hub_url=hub.url, log_level="quiet", metrics_dir="metrics")
+            runner.run_all_tests()
+            metrics_files = glob.glob(os.path.join("metrics", "*.json"))
+            if not metrics_files:
+                print("✗ The run wrote no metrics")
+                return False
+            with open(metrics_files[0], encoding='utf-8') as handle:
+                metrics = json.load(handle)
+    finally:
+        os.chdir(original_dir)
+        hub.shutdown()
+        hub.server_close()
+
+    connections = metrics['hub_connections']
+    print(f"Scenarios: {metrics['total_tests']} ({metrics['passed']} passed, {metrics['failed']} failed)")
+    print(f"Hub connections: {connections['requests']} requests, {connections['new']} new, "
+          f"{connections['reused']} reused (pool size {connections['pool_size']})")
+    passed = True
+    if not metrics['total_tests'] or metrics['failed']:
+        print("✗ Every scenario should match its expected outcome")
+        passed = False
+    if connections['new'] > connections['pool_size']:
+        print(f"✗ Expected at most {connections['pool_size']} new connections")
+        passed = False
+    if not connections['reused']:
+        print("✗ No request reused an open connection")
+        passed = False
+    print("✓ Stand-in hub check passed" if passed else "✗ Stand-in hub check failed")
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in WebDriver hub for the BrowserStack runner")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4444)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Seconds added to every command, to mimic a remote hub")
+    parser.add_argument("--check", action="store_true",
+                        help="Run the BrowserStack runner against a stand-in on a free port and verify it")
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(0 if run_check(args.latency) else 1)
+
+    hub = StandInHub(args.host, args.port, args.latency)
+    print(f"Stand-in hub listening on {hub.url}")
+    try:
+        hub.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+import argparse
+import os
+import sys
+from itertools import combinations
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+import automated_test_ddt
+from automated_test_ddt import (DataDrivenTestEngine, ExcelResultWriter, FixedLatency, LoginFormValidator,
+                                parse_latency_model)
+from latency_stats import percentiles
+from prepare_test_data import PARAMETER_DOMAINS, generate_scenarios, pairwise_combinations
+from run_journal import CheckpointJournal, scenario_fingerprint
+from scenario_loader import cache_path_for, load_test_scenarios, refresh_cache
+import scenario_loader
+from sharding import select_shard
+
+SHEET_NAME = "LoginTestScenarios"
+HEADERS = ("TestCaseID", "InputUsername", "InputPassword", "ExpectedOutcome", "ExpectedMessage", "TestCategory")
+# Three passing rows and one whose expectation is wrong
+SHEET_ROWS = [
+    ("TC001", "student", "Password123", "SUCCESS", "Logged In Successfully", "Positive"),
+    ("TC002", "student", "wrong", "FAILURE", "Your password is invalid", "Negative"),
+    ("TC003", "<script>", "Password123", "FAILURE", "Your username is invalid", "Security"),
+    ("TC004", "student", "wrong", "SUCCESS", "Logged In Successfully", "Negative")
+]
+
+
+def original_rules(username, password):
+    """LoginFormValidator.validate_login_attempt as it was before the rules were compiled"""
+    if not username:
+        return ("FAILURE", "Your username is invalid!")
+    if not password:
+        return ("FAILURE", "Your password is invalid!")
+    for pattern in ["<script>", "OR '1'='1", "';", "DROP TABLE", "<", ">"]:
+        if pattern.lower() in username.lower():
+            return ("FAILURE", "Your username is invalid!")
+        if pattern.lower() in password.lower():
+            return ("FAILURE", "Your password is invalid!")
+    if len(username) > 100:
+        return ("FAILURE", "Your username is invalid!")
+    if len(password) > 100:
+        return ("FAILURE", "Your password is invalid!")
+    if username != username.strip():
+        return ("FAILURE", "Your username is invalid!")
+    if username == "student":
+        if password == "Password123":
+            return ("SUCCESS", "Logged In Successfully")
+        return ("FAILURE", "Your password is invalid!")
+    return ("FAILURE", "Your username is invalid!")
+
+
+def write_sheet(filepath, rows):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = SHEET_NAME
+    sheet.append(HEADERS)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(filepath)
+
+
+def scenario(test_id, username="student", password="Password123"):
+    return {'TestCaseID': test_id, 'InputUsername': username, 'InputPassword': password,
+            'ExpectedOutcome': "SUCCESS", 'ExpectedMessage': "Logged In Successfully", 'TestCategory': "Positive"}
+
+
+class TestLoginFormValidator:
+
+    @pytest.mark.parametrize("memoize", [True, False])
+    def test_validate_many_matches_original_rules(self, memoize):
+        """validate_many agrees with the uncompiled rules on every generated and edge-case input"""
+        credentials = [(row[1], row[2]) for row in generate_scenarios("full")]
+        credentials += [("", ""), ("student", ""), ("<b>", "x';"), ("x" * 101, "ok"), ("student", "y" * 101),
+                        (" student", "Password123"), ("STUDENT", "Password123"), ("student", "Password123")]
+        # Repeats exercise the batch memo
+        credentials += credentials[:20]
+        usernames, passwords = zip(*credentials)
+
+        statuses, messages = LoginFormValidator.validate_many(usernames, passwords, memoize=memoize)
+
+        assert list(zip(statuses, messages)) == [original_rules(*pair) for pair in credentials]
+
+    def test_validate_many_rejects_columns_of_different_length(self):
+        with pytest.raises(ValueError):
+            LoginFormValidator.validate_many(["a", "b"], ["x"])
+        with pytest.raises(ValueError):
+            LoginFormValidator.validate_many(["a"], ["x", "y"], memoize=False)
+
+
+class TestLatencyStatistics:
+
+    def test_nearest_rank_percentiles(self):
+        ordered = [index / 100 for index in range(1, 101)]
+        assert percentiles(ordered) == {'p50': 0.5, 'p90': 0.9, 'p99': 0.99}
+        assert percentiles([0.2]) == {'p50': 0.2, 'p90': 0.2, 'p99': 0.2}
+        assert percentiles([0.1, 0.2, 0.3, 0.4], (25, 50, 75, 100)) == {'p25': 0.1, 'p50': 0.2, 'p75': 0.3,
+                                                                        'p100': 0.4}
+        with pytest.raises(ValueError):
+            percentiles([])
+
+    def test_tracker_latency_by_category(self):
+        # Referenced through the module: pytest would try to collect a Test* class name
+        tracker = automated_test_ddt.TestExecutionTracker()
+        for index in range(10, 0, -1):
+            tracker.record_outcome(f"S{index}", "PASSED", "", category="Security", duration=index / 10)
+        tracker.record_outcome("P1", "PASSED", "", category="Positive", duration=2.0)
+        tracker.record_outcome("P2", "FAILED", "", category="Positive", duration=4.0)
+        tracker.record_outcome("N1", "PASSED", "", category="Negative")
+
+        statistics = tracker.latency_statistics()
+
+        assert set(statistics) == {"Security", "Positive", "ALL"}
+        assert statistics["Security"] == pytest.approx({'count': 10, 'p50': 0.5, 'p90': 0.9, 'p99': 1.0,
+                                                        'max': 1.0, 'total': 5.5})
+        assert statistics["Positive"] == pytest.approx({'count': 2, 'p50': 2.0, 'p90': 4.0, 'p99': 4.0,
+                                                        'max': 4.0, 'total': 6.0})
+        assert statistics["ALL"] == pytest.approx({'count': 12, 'p50': 0.6, 'p90': 2.0, 'p99': 4.0,
+                                                   'max': 4.0, 'total': 11.5})
+
+
+class TestLatencyModels:
+
+    def test_parse_latency_model(self):
+        assert parse_latency_model("fixed:0.25").next_delay() == 0.25
+        assert isinstance(parse_latency_model("fixed:0"), FixedLatency)
+        for spec in ("lognormal:0.05", "fixed:x", "gaussian:1", "recorded:/nonexistent/latencies.txt"):
+            with pytest.raises(argparse.ArgumentTypeError):
+                parse_latency_model(spec)
+
+
+class TestWorkerPools:
+
+    @pytest.mark.parametrize("executor_type", DataDrivenTestEngine.EXECUTOR_TYPES)
+    def test_results_come_back_in_sheet_order(self, tmp_path, monkeypatch, executor_type):
+        monkeypatch.setattr(LoginFormValidator, "PAGE_LOAD_DELAY", 0)
+        scenarios = [scenario(f"TC{index:03d}") for index in range(1, 41)]
+        # Every third scenario expects the wrong outcome
+        for item in scenarios[::3]:
+            item['InputPassword'] = "wrong"
+        engine = DataDrivenTestEngine(str(tmp_path / "data.xlsx"), SHEET_NAME, workers=4, executor_type=executor_type,
+                                      log_level="quiet", metrics_dir=str(tmp_path))
+        engine._open_run_state()
+
+        results = engine._execute_scenarios(scenarios)
+        engine.journal.close()
+
+        assert [result['row'] for result in results] == list(range(1, 41))
+        assert [result['test_id'] for result in results] == [item['TestCaseID'] for item in scenarios]
+        assert [result['test_result'] for result in results] == \
+            ["FAILED" if index % 3 == 0 else "PASSED" for index in range(40)]
+        assert engine.tracker.total_assertions == 40
+        assert engine.tracker.passed_assertions == 26
+
+
+class TestStreaming:
+
+    def test_streaming_matches_the_in_memory_run(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(LoginFormValidator, "PAGE_LOAD_DELAY", 0)
+        excel_file = str(tmp_path / "data.xlsx")
+        write_sheet(excel_file, SHEET_ROWS)
+
+        def run(streaming, results_file):
+            engine = DataDrivenTestEngine(excel_file, SHEET_NAME, workers=2, streaming=streaming,
+                                          results_file=str(tmp_path / results_file), log_level="quiet",
+                                          metrics_dir=str(tmp_path / "metrics"))
+            engine.execute_test_suite()
+            rows = [{column: result[column] for column in ('test_id', 'actual_status', 'actual_message',
+                                                           'test_result', 'category')}
+                    for result in ExcelResultWriter.read_results(str(tmp_path / results_file))]
+            return rows, (engine.tracker.total_assertions, engine.tracker.passed_assertions)
+
+        streamed = run(True, "streamed.xlsx")
+        in_memory = run(False, "in_memory.xlsx")
+
+        assert streamed == in_memory
+        assert [row['test_id'] for row in streamed[0]] == [row[0] for row in SHEET_ROWS]
+        assert streamed[1] == (4, 3)
+
+
+class TestResultWorkbooks:
+
+    def test_results_file_round_trip(self, tmp_path, monkeypatch):
+        """--results-file writes a separate workbook and leaves the source sheet alone"""
+        monkeypatch.setattr(LoginFormValidator, "PAGE_LOAD_DELAY", 0)
+        monkeypatch.chdir(tmp_path)
+        write_sheet("test_data.xlsx", SHEET_ROWS)
+        source_before = (tmp_path / "test_data.xlsx").read_bytes()
+        monkeypatch.setattr(sys, "argv", ["automated_test_ddt.py", "--results-file", "results.xlsx",
+                                          "--log-level", "quiet"])
+
+        automated_test_ddt.main()
+
+        workbook = load_workbook("results.xlsx", read_only=True)
+        header = next(workbook["TestResults"].iter_rows(values_only=True))
+        workbook.close()
+        assert list(header) == ['TestCaseID', 'ActualOutcome', 'ActualMessage', 'TestResult', 'ExecutionTime',
+                                'TestCategory', 'DurationSeconds']
+        results = ExcelResultWriter.read_results("results.xlsx")
+        assert [(r['test_id'], r['actual_status'], r['test_result']) for r in results] == [
+            ("TC001", "SUCCESS", "PASSED"),
+            ("TC002", "FAILURE", "PASSED"),
+            ("TC003", "FAILURE", "PASSED"),
+            ("TC004", "FAILURE", "FAILED")
+        ]
+        assert all(r['duration'] is not None for r in results)
+        assert (tmp_path / "test_data.xlsx").read_bytes() == source_before
+
+    def test_write_back_into_the_source_sheet(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(LoginFormValidator, "PAGE_LOAD_DELAY", 0)
+        excel_file = str(tmp_path / "data.xlsx")
+        write_sheet(excel_file, SHEET_ROWS)
+
+        DataDrivenTestEngine(excel_file, SHEET_NAME, log_level="quiet",
+                             metrics_dir=str(tmp_path / "metrics")).execute_test_suite()
+
+        workbook = load_workbook(excel_file)
+        rows = list(workbook[SHEET_NAME].iter_rows(values_only=True))
+        fills = [row[8].fill.start_color.rgb for row in workbook[SHEET_NAME].iter_rows(min_row=2)]
+        workbook.close()
+        assert rows[0] == HEADERS + ('ActualOutcome', 'ActualMessage', 'TestResult', 'ExecutionTime')
+        assert [row[:6] for row in rows[1:]] == SHEET_ROWS
+        assert [row[6:9] for row in rows[1:]] == [
+            ("SUCCESS", "Logged In Successfully", "PASSED"),
+            ("FAILURE", "Your password is invalid!", "PASSED"),
+            ("FAILURE", "Your username is invalid!", "PASSED"),
+            ("FAILURE", "Your password is invalid!", "FAILED")
+        ]
+        assert fills == ["00C6EFCE", "00C6EFCE", "00C6EFCE", "00FFC7CE"]
+
+
+class TestScenarioGeneration:
+
+    def test_pairwise_covers_every_value_pair(self):
+        sizes = [len(domain) for _, domain in PARAMETER_DOMAINS]
+        rows = list(pairwise_combinations(sizes))
+
+        for i, j in combinations(range(len(sizes)), 2):
+            covered = {(row[i], row[j]) for row in rows}
+            assert len(covered) == sizes[i] * sizes[j]
+        assert rows == list(pairwise_combinations(sizes))
+
+
+class TestSharding:
+
+    def test_shards_partition_the_sheet_independently_of_row_order(self):
+        scenarios = [scenario(f"TC{index:04d}") for index in range(200)]
+        shards = [[s['TestCaseID'] for s in select_shard(scenarios, index, 4)] for index in range(4)]
+        reversed_shards = [{s['TestCaseID'] for s in select_shard(scenarios[::-1], index, 4)} for index in range(4)]
+
+        assert sorted(test_id for shard in shards for test_id in shard) == [s['TestCaseID'] for s in scenarios]
+        assert [set(shard) for shard in shards] == reversed_shards
+        assert all(shards)
+
+
+class TestRunState:
+
+    def test_resume_replays_journal_in_sheet_order(self, tmp_path, monkeypatch):
+        """Journaled rows are reused in place, and only the others are evaluated"""
+        monkeypatch.setattr(LoginFormValidator, "PAGE_LOAD_DELAY", 0)
+        excel_file = str(tmp_path / "data.xlsx")
+        scenarios = [scenario(f"TC{index:03d}") for index in range(1, 11)]
+        engine = DataDrivenTestEngine(excel_file, SHEET_NAME, log_level="quiet", metrics_dir=str(tmp_path))
+
+        # An interrupted run that finished every other scenario
+        version = LoginFormValidator.rules_fingerprint()
+        journal = CheckpointJournal(engine.journal_file, resume=False)
+        for item in scenarios[::2]:
+            journal.record(scenario_fingerprint(item, version),
+                           {'test_id': item['TestCaseID'], 'test_result': "PASSED", 'duration': 0.5}, "earlier run")
+        journal.close()
+
+        engine.resume = True
+        engine._open_run_state()
+        results = list(engine._iter_results(scenarios, batch_size=1))
+        engine.journal.close()
+
+        assert [result['test_id'] for result, _ in results] == [item['TestCaseID'] for item in scenarios]
+        assert [details.endswith("| reused") for _, details in results] == [index % 2 == 0 for index in range(10)]
+        # The resumed run journals what it evaluated, after the replayed entries
+        assert len(CheckpointJournal(engine.journal_file).entries) == len(scenarios)
+
+    def test_journal_flushes_in_groups_and_on_close(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(CheckpointJournal, "FLUSH_EVERY", 3)
+        monkeypatch.setattr(CheckpointJournal, "FLUSH_INTERVAL", 3600)
+        path = str(tmp_path / "journal.jsonl")
+        journal = CheckpointJournal(path, resume=False)
+        for index in range(5):
+            journal.record(f"key{index}", {'test_id': f"TC{index:03d}"}, "")
+
+        # Only the first full group has reached the file so far
+        assert len(CheckpointJournal(path).entries) == 3
+        journal.close()
+        assert len(CheckpointJournal(path).entries) == 5
+
+    def test_scenario_cache_is_invalidated_by_changes_only(self, tmp_path, monkeypatch):
+        excel_file = str(tmp_path / "data.xlsx")
+        write_sheet(excel_file, [("TC001", "student", "Password123", "SUCCESS", "Logged In", "Positive")])
+        parses = []
+        parse_workbook = scenario_loader._parse_workbook
+        monkeypatch.setattr(scenario_loader, "_parse_workbook",
+                            lambda *args: parses.append(args) or parse_workbook(*args))
+
+        first = load_test_scenarios(excel_file, SHEET_NAME)
+        assert load_test_scenarios(excel_file, SHEET_NAME) == first
+        assert len(parses) == 1
+
+        # Touched but identical content: the hash check keeps the cache
+        stat = os.stat(excel_file)
+        os.utime(excel_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        assert load_test_scenarios(excel_file, SHEET_NAME) == first
+        assert len(parses) == 1
+
+        # Changed content is parsed again
+        write_sheet(excel_file, [("TC001", "student", "wrong", "FAILURE", "Your password is invalid!", "Negative")])
+        assert load_test_scenarios(excel_file, SHEET_NAME)[0]['InputPassword'] == "wrong"
+        assert len(parses) == 2
+
+        # A writer that refreshes the cache after saving does not force a parse
+        write_sheet(excel_file, [("TC002", "student", "Password123", "SUCCESS", "Logged In", "Positive")])
+        refresh_cache(excel_file, SHEET_NAME, [HEADERS, ("TC002", "student", "Password123", "SUCCESS",
+                                                         "Logged In", "Positive")])
+        assert load_test_scenarios(excel_file, SHEET_NAME)[0]['TestCaseID'] == "TC002"
+        assert len(parses) == 2
+        assert os.path.exists(cache_path_for(excel_file, SHEET_NAME))
+
+    def test_corrupted_scenario_cache_is_a_miss(self, tmp_path):
+        excel_file = str(tmp_path / "data.xlsx")
+        write_sheet(excel_file, [("TC001", "student", "Password123", "SUCCESS", "Logged In", "Positive")])
+        expected = load_test_scenarios(excel_file, SHEET_NAME, use_cache=False)
+
+        for garbage in (b"\x80\x04garbage that is not a pickle", b"\x80\x05\x95", b"", os.urandom(256)):
+            with open(cache_path_for(excel_file, SHEET_NAME), "wb") as handle:
+                handle.write(garbage)
+            assert load_test_scenarios(excel_file, SHEET_NAME) == expected
+            # The broken cache was replaced by a good one
+            assert load_test_scenarios(excel_file, SHEET_NAME) == expected
@@ -0,0 +1,172 @@
+"""
+WebDriver Command Timing
+Wraps a driver's command executor so every remote command (one HTTP round trip
+to the hub or the local driver binary) is timed and counted by command type.
+One CommandTimer per driver gives per-session latency histograms that show
+whether navigation, element lookups or the network dominate a run.
+
+Shared by sqat4.py, the assignment 5 pytest suite and the assignment 6
+BrowserStack runner, which each put this directory on their import path.
+
+Usage:
+    timer = instrument_driver(driver, "Chrome_Windows#1")
+    ...
+    print("\n".join(timer.summary_lines()))
+"""
+
+import threading
+import time
+from array import array
+from typing import Dict, Iterable, List
+
+from latency_stats import PERCENTILES, percentiles
+
+# Friendlier names for the Selenium command ids we care most about; others keep their id
+COMMAND_TYPES = {
+    "get": "navigate",
+    "goBack": "navigate",
+    "goForward": "navigate",
+    "refresh": "navigate",
+    "findElement": "findElement",
+    "findElements": "findElements",
+    "findChildElement": "findElement",
+    "findChildElements": "findElements",
+    "sendKeysToElement": "sendKeys",
+    "clearElement": "clear",
+    "clickElement": "click",
+    "getElementText": "getText",
+    "screenshot": "screenshot",
+    "elementScreenshot": "screenshot",
+    "w3cExecuteScript": "executeScript",
+    "w3cExecuteScriptAsync": "executeAsyncScript",
+    "quit": "quit"
+}
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open-ended
+HISTOGRAM_BOUNDS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class CommandTimer:
+    """Per-command-type durations of one driver session"""
+
+    def __init__(self, session_name: str = ""):
+        self.session_name = session_name
+        self.command_count = 0
+        # Command type -> durations in seconds, packed as C doubles
+        self.durations = {}
+        self._lock = threading.Lock()
+
+    def record(self, command: str, seconds: float):
+        """Records one finished command"""
+        command_type = COMMAND_TYPES.get(command, command)
+        with self._lock:
+            self.command_count += 1
+            samples = self.durations.get(command_type)
+            if samples is None:
+                samples = self.durations[command_type] = array('d')
+            samples.append(seconds)
+
+    @staticmethod
+    def merge(timers: Iterable["CommandTimer"], session_name: str = "ALL") -> "CommandTimer":
+        """Combines several sessions into one timer, e.g. for a run-wide summary"""
+        merged = CommandTimer(session_name)
+        for timer in timers:
+            with timer._lock:
+                merged.command_count += timer.command_count
+                for command_type, samples in timer.durations.items():
+                    merged.durations.setdefault(command_type, array('d')).extend(samples)
+        return merged
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        Returns: {command type: {'count', 'total', 'p50', 'p90', 'p99', 'max' (seconds),
+                  'histogram': {bucket label: count}}}, slowest total first
+        """
+        with self._lock:
+            samples = {command_type: sorted(values) for command_type, values in self.durations.items()}
+
+        summary = {}
+        for command_type, ordered in sorted(samples.items(), key=lambda item: -sum(item[1])):
+            count = len(ordered)
+            entry = {'count': count, 'total': sum(ordered)}
+            entry.update(percentiles(ordered, PERCENTILES))
+            entry['max'] = ordered[-1]
+            entry['histogram'] = self._histogram(ordered)
+            summary[command_type] = entry
+        return summary
+
+    @staticmethod
+    def _histogram(ordered: List[float]) -> Dict[str, int]:
+        buckets = {}
+        lower = 0
+        index = 0
+        for bound in HISTOGRAM_BOUNDS_MS + (None,):
+            count = 0
+            while index < len(ordered) and (bound is None or ordered[index] * 1000 <= bound):
+                count += 1
+                index += 1
+            label = f"<={bound}ms" if bound is not None else f">{lower}ms"
+            buckets[label] = count
+            lower = bound
+        return buckets
+
+    def summary_lines(self) -> List[str]:
+        """Human-readable table of the slowest command types"""
+        lines = [f"  {'Command':<20}{'Count':>7}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'Max ms':>9}{'Total s':>9}"]
+        for command_type, entry in self.summary().items():
+            lines.append(f"  {command_type:<20}{entry['count']:>7}"
+                         f"{entry['p50'] * 1000:>9.1f}{entry['p90'] * 1000:>9.1f}"
+                         f"{entry['p99'] * 1000:>9.1f}{entry['max'] * 1000:>9.1f}{entry['total']:>9.2f}")
+        return lines
+
+    def to_dict(self) -> Dict:
+        """JSON-ready form for run metrics"""
+        return {
+            'session': self.session_name,
+            'commands': self.command_count,
+            'by_type': self.summary()
+        }
+
+    def to_samples(self) -> Dict:
+        """JSON-ready raw durations, e.g. to merge timers of several processes"""
+        with self._lock:
+            return {
+                'session': self.session_name,
+                'commands': self.command_count,
+                'durations': {command_type: list(samples) for command_type, samples in self.durations.items()}
+            }
+
+    @staticmethod
+    def from_samples(data: Dict) -> "CommandTimer":
+        """Rebuilds a timer written by to_samples()"""
+        timer = CommandTimer(data['session'])
+        timer.command_count = data['commands']
+        timer.durations = {command_type: array('d', samples) for command_type, samples in data['durations'].items()}
+        return timer
+
+
+def instrument_driver(driver, session_name: str = "") -> CommandTimer:
+    """
+    Times every command the driver sends through its command executor
+
+    Works for remote and local drivers alike; element methods go through the same
+    executor. The timer is also available as driver.command_timer; assigning a new
+    CommandTimer there starts a separate measurement on the same driver, e.g. per test
+    when a browser is reused.
+
+    Returns: The driver's CommandTimer
+    """
+    timer = CommandTimer(session_name)
+    executor = driver.command_executor
+    execute = executor.execute
+
+    def timed_execute(command, params):
+        started = time.perf_counter()
+        try:
+            return execute(command, params)
+        finally:
+            driver.command_timer.record(command, time.perf_counter() - started)
+
+    executor.execute = timed_execute
+    driver.command_timer = timer
+    return timer
@@ -0,0 +1,27 @@
+"""
+Latency Percentiles
+Nearest-rank percentiles over sorted duration samples, shared by the
+WebDriver command timer (driver_metrics) and the data-driven engine's
+per-category scenario statistics.
+"""
+
+import math
+from typing import Dict, Iterable, Sequence
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentiles(ordered: Sequence[float], levels: Iterable[int] = PERCENTILES) -> Dict[str, float]:
+    """
+    Nearest-rank percentiles of samples sorted in ascending order
+
+    Args:
+        ordered: Non-empty, ascending samples
+        levels: Percentiles to report, e.g. (50, 90, 99)
+
+    Returns: {'p50': ..., 'p90': ..., 'p99': ...}
+    """
+    count = len(ordered)
+    if not count:
+        raise ValueError("percentiles() needs at least one sample")
+    return {f'p{level}': ordered[max(1, math.ceil(level / 100 * count)) - 1] for level in levels}
@@ -1,14 +1,21 @@
+import os
+import sys
 import time
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import Select, WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+# WebDriver command timing lives in the repository's shared helpers directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "shared"))
+from driver_metrics import instrument_driver
+
 
 class SQAT_Assignment_Final:
 
     def run_tests(self):
         driver = webdriver.Chrome()
+        command_timer = instrument_driver(driver, "sqat4")
         driver.maximize_window()
         wait = WebDriverWait(driver, 10)
 
@@ -63,6 +70,8 @@ class SQAT_Assignment_Final:
         finally:
             print("\nClosing browser...")
             driver.quit()
+            print(f"\nWebDriver commands: {command_timer.command_count}")
+            print("\n".join(command_timer.summary_lines()))
 
 
 if __name__ == "__main__":